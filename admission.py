@@ -0,0 +1,99 @@
+# admission.py
+import asyncio
+import contextlib
+import math
+import os
+import time
+from collections import OrderedDict, deque
+
+# --- Configuration ---
+LIKE_MAX_CONCURRENCY = int(os.getenv("LIKE_MAX_CONCURRENCY", 10))   # Like API calls in flight at once
+LIKE_MAX_QUEUE = int(os.getenv("LIKE_MAX_QUEUE", 100))              # Calls allowed to wait for a slot
+
+EMA_WEIGHT = 0.2    # Weight of the newest sample in the moving averages
+
+
+class AdmissionRejected(Exception):
+    """Raised when the wait queue is full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Too many pending requests, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Caps concurrent upstream calls and queues the excess in a bounded queue.
+    Waiting calls are served round-robin across guilds so one busy guild cannot starve the others.
+    """
+
+    def __init__(self, max_concurrency: int = LIKE_MAX_CONCURRENCY, max_queue: int = LIKE_MAX_QUEUE):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.active = 0
+        self.queued = 0
+        self.avg_wait = 0.0
+        self.avg_service = 1.0
+        self._queues = OrderedDict()    # guild_id -> deque of waiting futures, in round-robin order
+
+    @contextlib.asynccontextmanager
+    async def slot(self, guild_id=None):
+        """Hold one concurrency slot for the duration of the block."""
+        await self.acquire(guild_id)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - start
+            self.avg_service += EMA_WEIGHT * (elapsed - self.avg_service)
+            self.release()
+
+    def estimated_wait(self) -> int:
+        """Rough number of seconds before a new request would get a slot."""
+        return max(1, math.ceil((self.queued / self.max_concurrency + 1) * self.avg_service))
+
+    async def acquire(self, guild_id=None):
+        if self.active < self.max_concurrency and self.queued == 0:
+            self.active += 1
+            self._record_wait(0.0)
+            return
+        if self.queued >= self.max_queue:
+            raise AdmissionRejected(self.estimated_wait())
+
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(guild_id, deque()).append(future)
+        self.queued += 1
+        enqueued_at = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # The slot was handed over just before the cancellation
+            else:
+                self._discard(guild_id, future)
+            raise
+        self._record_wait(time.monotonic() - enqueued_at)
+
+    def release(self):
+        self.active -= 1
+        while self.active < self.max_concurrency and self.queued:
+            guild_id, waiters = next(iter(self._queues.items()))
+            future = waiters.popleft()
+            self.queued -= 1
+            if waiters:
+                self._queues.move_to_end(guild_id)
+            else:
+                del self._queues[guild_id]
+            self.active += 1
+            future.set_result(None)
+
+    def _discard(self, guild_id, future):
+        waiters = self._queues.get(guild_id)
+        if waiters and future in waiters:
+            waiters.remove(future)
+            self.queued -= 1
+            if not waiters:
+                del self._queues[guild_id]
+
+    def _record_wait(self, wait: float):
+        self.avg_wait += EMA_WEIGHT * (wait - self.avg_wait)
@@ -1,36 +1,22 @@
+import startup  # First, so the startup breakdown includes module imports
 import discord
 from discord.ext import commands, tasks
+import logging
 import os
-import traceback
-from flask import Flask
-import threading
+import signal
 import sys
-import aiohttp
+import time
 
 from dotenv import load_dotenv
-from token_manager import check_and_refresh_on_startup, check_token_validity
+from token_manager import check_and_refresh_on_startup, check_token_validity, notifier
+from http_client import get_session, close_session
+import metrics
+import web_server
+import settings
+import state_backend
+import logs
 import asyncio
 
-app = Flask(__name__)
-bot_name = "None"
-
-@app.route('/')
-def home():
-    return f"Bot {bot_name} is active"
-
-
-def run_flask():
-    port = int(os.environ.get("PORT", 10000))
-    if os.name == 'nt':
-        from waitress import serve
-        serve(app, host="0.0.0.0", port=port)
-    else:
-        app.run(host='0.0.0.0', port=port)
-
-
-flask_thread = threading.Thread(target=run_flask, daemon=True)
-flask_thread.start()
-
 if os.path.exists(".env"):
     load_dotenv()
 
@@ -38,48 +24,80 @@ TOKEN = os.getenv("DISCORD_TOKEN")
 if not TOKEN:
     raise ValueError("DISCORD_TOKEN not found in environment variables")
 
+logger = logging.getLogger("seemu")
+
 extensions = [
     "cogs.likeCommands"
 ]
 
 
-class Seemu(commands.Bot):
-    def __init__(self, command_prefix: str, intents: discord.Intents, **kwargs):
+class Seemu(commands.AutoShardedBot):
+    """
+    The bot. Run directly, it handles every shard in one process. Started by launcher.py,
+    each worker handles a range of shards; worker 0 is the leader and is the only one that
+    syncs the command tree, refreshes tokens and runs auto-like jobs.
+    """
+
+    def __init__(self, command_prefix: str, intents: discord.Intents, worker_index: int = 0, worker_count: int = 1, **kwargs):
         super().__init__(command_prefix=command_prefix, intents=intents, **kwargs)
+        self.worker_index = worker_index
+        self.worker_count = worker_count
+        self.is_leader = worker_index == 0
         self.session = None
         self.initialized = False
+        self.loop_lag_task = None
+        self.web_runner = None
+        self.token_startup_task = None
+        self.setup_done_at = None
 
     async def setup_hook(self) -> None:
-        self.session = aiohttp.ClientSession()
-
-        for ext in extensions:
-            try:
-                await self.load_extension(ext)
-                print(f"✅ {ext} loaded successfully")
-            except Exception as e:
-                print(f"❌ Failed to load {ext}: {e}")
-                traceback.print_exc()
-
-        await self.tree.sync()
-        print("✔ All cogs loaded")
+        startup.timer.record("imports_and_login", time.monotonic() - startup.PROCESS_START)
+        with startup.timer.phase("http_server"):
+            self.session = get_session()
+            self.loop_lag_task = asyncio.create_task(metrics.monitor_loop_lag())
+            self.web_runner = await web_server.start(self, port=web_server.PORT + self.worker_index)
+            settings.watcher.start()
+
+        with startup.timer.phase("extensions"):
+            for ext in extensions:
+                try:
+                    await self.load_extension(ext)
+                    logger.info("✅ %s loaded successfully", ext)
+                except Exception:
+                    logger.exception("❌ Failed to load %s", ext)
+
+        if self.is_leader:
+            with startup.timer.phase("command_sync"):
+                await startup.sync_commands_if_changed(self)
+        logger.info("✔ All cogs loaded")
         self.initialized = True
         self.update_activity_task.start()
+        self.setup_done_at = time.monotonic()
 
     async def on_ready(self):
-        global bot_name
         if not self.initialized:
             return
+        if startup.timer.ready_after is None:
+            startup.timer.record("gateway_connect", time.monotonic() - self.setup_done_at)
+            startup.timer.ready()
 
         server_count = len(self.guilds)
         activity = discord.Game(name=f"Sharing likes on {server_count} servers")
         await self.change_presence(activity=activity)
-        bot_name = f"{self.user}"
 
-        
-        await check_and_refresh_on_startup(self.session)
+        # Token checks run in the background so commands are served right away.
+        # on_ready fires again after reconnects: start them only once.
+        if self.is_leader and self.token_startup_task is None:
+            self.token_startup_task = asyncio.create_task(self.start_token_tasks())
 
-       
-        asyncio.create_task(check_token_validity(self.session))
+    async def start_token_tasks(self):
+        with startup.timer.phase("token_startup_checks"):
+            try:
+                await check_and_refresh_on_startup(self.session)
+            except Exception:
+                logger.exception("Startup token check failed")
+        logger.info("Token startup checks done in %.2fs", startup.timer.phases["token_startup_checks"])
+        await check_token_validity(self.session)
 
     @tasks.loop(minutes=5)
     async def update_activity_task(self):
@@ -87,20 +105,27 @@ class Seemu(commands.Bot):
             server_count = len(self.guilds)
             activity = discord.Game(name=f"Sharing likes on {server_count} servers !! ")
             await self.change_presence(activity=activity)
-            print(f"Activité mise à jour : Partage de likes sur {server_count} serveurs")
-        except Exception as e:
-            print(f"⚠️ Erreur lors de la mise à jour de l'activité : {e}")
-            traceback.print_exc()
+            logger.info("Activité mise à jour : Partage de likes sur %d serveurs", server_count)
+        except Exception:
+            logger.exception("⚠️ Erreur lors de la mise à jour de l'activité")
 
     @update_activity_task.before_loop
     async def before_update_activity_task(self):
         await self.wait_until_ready()
-        print("Bot ready, starting activity update loop.")
+        logger.info("Bot ready, starting activity update loop.")
 
     async def close(self):
-        if self.session:
-            await self.session.close()
+        settings.watcher.stop()
+        if self.web_runner:
+            await self.web_runner.cleanup()
+        if self.loop_lag_task:
+            self.loop_lag_task.cancel()
+        if self.token_startup_task:
+            self.token_startup_task.cancel()
+        await notifier.close()
+        await close_session()
         await super().close()
+        state_backend.close()   # After the cogs are unloaded, they may still write to it
 
     @commands.Cog.listener()
     async def on_command_error(self, ctx, error):
@@ -123,23 +148,41 @@ class Seemu(commands.Bot):
         elif isinstance(error, commands.CommandNotFound):
             return
 
-        print(f"Unhandled error: {error}")
-        traceback.print_exc()
+        logger.error("Unhandled error in %s", ctx.command, exc_info=error)
         await ctx.send("⚠️ An unexpected error occurred. [1214]", ephemeral=True)
 
 
+def run_worker(shard_ids: list[int], shard_count: int, worker_index: int, worker_count: int):
+    """Entry point of a launcher.py worker process."""
+    logs.setup()
+    # The launcher stops workers with SIGTERM: shut down like on Ctrl+C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    logger.info("Worker %d/%d starting with shards %s of %d", worker_index, worker_count, shard_ids, shard_count)
+    bot = Seemu(command_prefix="!", intents=discord.Intents.all(), shard_ids=shard_ids, shard_count=shard_count,
+                worker_index=worker_index, worker_count=worker_count)
+    try:
+        bot.run(TOKEN, log_handler=None)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        logs.shutdown()
+
+
 if __name__ == "__main__":
+    logs.setup()
     try:
         intents = discord.Intents.all()
         bot = Seemu(command_prefix="!", intents=intents)
-        bot.run(TOKEN)
+        # Logging is configured by logs.setup(), not by discord.py
+        bot.run(TOKEN, log_handler=None)
     except discord.errors.LoginFailure:
-        print("❌ Invalid Discord token")
+        logger.critical("❌ Invalid Discord token")
         sys.exit(1)
     except KeyboardInterrupt:
-        print("\n🛑 Stopping bot...")
+        logger.info("🛑 Stopping bot...")
         sys.exit(0)
-    except Exception as e:
-        print(f"⚠️ Unexpected error: {e}")
-        traceback.print_exc()
+    except Exception:
+        logger.exception("⚠️ Unexpected error")
         sys.exit(1)
+    finally:
+        logs.shutdown()
@@ -0,0 +1,290 @@
+# auto_like_scheduler.py
+import asyncio
+import heapq
+import json
+import logging
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+AUTO_LIKE_FILE = "auto_likes.json"
+AUTO_LIKE_INTERVAL = 24 * 60 * 60       # Seconds between two likes for the same job
+CATCHUP_WINDOW = 6 * 60 * 60            # Missed runs older than this are skipped, not replayed
+RETRY_DELAY = 60 * 60                   # Delay before retrying a job whose run raised
+BATCH_WINDOW = 60                       # Batch mode: jobs due within this many seconds run together
+BATCH_SLOT = 5 * 60                     # Batch mode: new jobs are aligned to slots of this size
+JOB_SYNC_INTERVAL = 30                  # Shared backend: seconds between two reloads of jobs added by other workers
+
+
+class AutoLikeScheduler:
+    """
+    Single worker that runs every auto-like job from a min-heap ordered by next run time.
+    Jobs are persisted to AUTO_LIKE_FILE so they survive restarts. The file is written
+    from a single background thread, so writes stay ordered and off the event loop.
+
+    Either run_job(job) is called once per due job, or, in batch mode, run_batch(jobs) is
+    called with every job due within BATCH_WINDOW and returns the jobs that must be retried.
+
+    With a shared state backend (a state_backend.AsyncBackend), jobs are stored there one by one
+    instead of in AUTO_LIKE_FILE, so any worker can add or remove them while only the leader runs them.
+    Every worker reloads them every JOB_SYNC_INTERVAL.
+    """
+
+    def __init__(self, run_job=None, path: str = AUTO_LIKE_FILE, run_batch=None, backend=None):
+        self.run_job = run_job
+        self.run_batch = run_batch
+        self.path = path
+        self.backend = backend
+        self.jobs = {}      # task_key -> job dict
+        self._heap = []     # (next_run, task_key); stale entries are skipped lazily
+        self._wakeup = asyncio.Event()
+        self._worker = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="auto-likes")
+
+    @staticmethod
+    def make_key(uid: str, server: str, channel_id: int) -> str:
+        return f"{uid}_{server}_{channel_id}"
+
+    async def load(self):
+        """Load persisted jobs and rebuild the heap, bounding catch-up of missed runs."""
+        if self.backend is not None:
+            stored = await self.backend.items("auto_likes") or await self._import_file()
+        elif not os.path.exists(self.path):
+            return
+        else:
+            try:
+                with open(self.path, 'r') as f:
+                    stored = json.load(f).get("jobs", {})
+            except json.JSONDecodeError:
+                logger.warning("Auto-like file %s is corrupt or empty, starting with no jobs", self.path)
+                return
+
+        now = time.time()
+        skipped = []
+        for key, job in stored.items():
+            next_run = job.get("next_run", now)
+            if next_run < now - CATCHUP_WINDOW:
+                # Too late to catch up: skip the missed runs and keep the original time of day
+                missed = int((now - next_run) // AUTO_LIKE_INTERVAL) + 1
+                next_run += missed * AUTO_LIKE_INTERVAL
+                skipped.append(key)
+            job["next_run"] = next_run
+            self.jobs[key] = job
+            heapq.heappush(self._heap, (next_run, key))
+        if self.backend is not None and skipped:
+            await self.save(skipped)  # Otherwise refresh() would bring the missed run times back
+        logger.info("✅ %d auto-like jobs restored", len(self.jobs))
+
+    async def _import_file(self) -> dict:
+        """Copy AUTO_LIKE_FILE into an empty shared backend, once, so switching to STATE_BACKEND keeps the jobs."""
+        if not os.path.exists(self.path) or not await self.backend.claim_once(f"import:{self.path}"):
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                stored = json.load(f).get("jobs", {})
+        except json.JSONDecodeError:
+            logger.warning("Auto-like file %s is corrupt or empty, nothing to import", self.path)
+            return {}
+        for key, job in stored.items():
+            await self.backend.set("auto_likes", key, job)
+        logger.warning("Imported %d auto-like jobs from %s into the shared backend; the file is no longer used",
+                       len(stored), self.path)
+        return stored
+
+    async def refresh(self):
+        """Shared backend only: pick up jobs added, rescheduled or removed by other workers."""
+        if self.backend is None:
+            return
+        stored = await self.backend.items("auto_likes")
+        for key in list(self.jobs):
+            if key not in stored:
+                del self.jobs[key]  # Its heap entry is discarded when it reaches the top
+        for key, job in stored.items():
+            current = self.jobs.get(key)
+            if current is None or current["next_run"] != job["next_run"]:
+                self.jobs[key] = job
+                self._push(job["next_run"], key)
+
+    async def save(self, keys=None, skip_removed: bool = False):
+        """
+        Persist the given jobs (all of them by default). With skip_removed, jobs another
+        worker deleted from the shared backend are dropped instead of written back.
+        """
+        if self.backend is not None:
+            for key in list(self.jobs if keys is None else keys):
+                if key not in self.jobs:
+                    continue
+                if skip_removed and await self.backend.get("auto_likes", key) is None:
+                    del self.jobs[key]  # Its heap entry is discarded when it reaches the top
+                    continue
+                await self.backend.set("auto_likes", key, self.jobs[key])
+            return
+        snapshot = {key: dict(job) for key, job in self.jobs.items()}
+        self._executor.submit(self._write, snapshot).add_done_callback(self._log_write_error)
+
+    def _write(self, snapshot: dict):
+        temp_file = self.path + ".tmp"
+        with open(temp_file, 'w') as f:
+            json.dump({"jobs": snapshot}, f)
+        os.replace(temp_file, self.path)
+
+    def _log_write_error(self, future):
+        if future.exception() is not None:
+            logger.error("Failed to write %s: %s", self.path, future.exception())
+
+    def close(self):
+        """Stop the worker and wait for pending writes."""
+        self.stop()
+        self._executor.shutdown(wait=True)
+
+    def start(self):
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+
+    def start_sync(self):
+        """Shared backend, on workers that do not run the jobs: keep `jobs` current for the commands."""
+        if self._worker is None and self.backend is not None:
+            self._worker = asyncio.create_task(self._sync())
+
+    def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+    async def add(self, uid: str, server: str, channel_id: int, user_id: int) -> bool:
+        """Schedule a new job. Returns False if the job already exists."""
+        key = self.make_key(uid, server, channel_id)
+        if key in self.jobs:
+            return False
+        if self.backend is not None and await self.backend.get("auto_likes", key) is not None:
+            return False  # Added by another worker since the last refresh
+        if key in self.jobs:
+            return False  # Added by a concurrent command while the backend was checked
+        job = {
+            "uid": uid,
+            "server": server,
+            "channel_id": channel_id,
+            "user_id": user_id,
+            "next_run": self._first_run(),
+        }
+        self.jobs[key] = job
+        self._push(job["next_run"], key)
+        await self.save([key])
+        return True
+
+    async def remove(self, uid: str, server: str, channel_id: int) -> bool:
+        """Remove a job. Returns False if it does not exist. Its heap entry is discarded when it reaches the top."""
+        key = self.make_key(uid, server, channel_id)
+        job = self.jobs.pop(key, None)
+        if self.backend is not None:
+            if job is None and await self.backend.get("auto_likes", key) is None:
+                return False
+            await self.backend.delete("auto_likes", key)
+            return True
+        if job is None:
+            return False
+        await self.save()
+        return True
+
+    def _first_run(self) -> float:
+        next_run = time.time() + AUTO_LIKE_INTERVAL
+        if self.run_batch is not None:
+            # Align to a slot boundary so jobs created close together run in the same batch
+            next_run = math.ceil(next_run / BATCH_SLOT) * BATCH_SLOT
+        return next_run
+
+    def _push(self, next_run: float, key: str):
+        heapq.heappush(self._heap, (next_run, key))
+        # Wake the worker only if this job became the earliest one
+        if self._heap[0][1] == key:
+            self._wakeup.set()
+
+    async def _sleep_until_due(self):
+        self._wakeup.clear()
+        timeout = None
+        if self._heap:
+            timeout = max(0.0, self._heap[0][0] - time.time())
+        if self.backend is not None:
+            timeout = JOB_SYNC_INTERVAL if timeout is None else min(timeout, JOB_SYNC_INTERVAL)
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def _pop_due(self, horizon: float) -> list:
+        """Pop every live job whose next run is before `horizon`."""
+        due = []
+        while self._heap and self._heap[0][0] <= horizon:
+            next_run, key = heapq.heappop(self._heap)
+            job = self.jobs.get(key)
+            if job is not None and job["next_run"] == next_run:
+                due.append((key, job))
+            # Otherwise removed or rescheduled since this entry was pushed
+        return due
+
+    async def _execute(self, due: list) -> set:
+        """Run the due jobs and return the keys of those that must be retried."""
+        if self.run_batch is not None:
+            try:
+                failed = {id(job) for job in await self.run_batch([job for _, job in due])}
+                return {key for key, job in due if id(job) in failed}
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Error in auto-like batch", extra={"jobs": len(due)})
+                return {key for key, _ in due}
+
+        failed = set()
+        for key, job in due:
+            try:
+                await self.run_job(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Error in auto-like job", extra={"job": key})
+                failed.add(key)
+        return failed
+
+    async def _refresh_logged(self):
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning("Failed to reload auto-like jobs", extra={"error": str(e)})
+
+    async def _sync(self):
+        while True:
+            await asyncio.sleep(JOB_SYNC_INTERVAL)
+            await self._refresh_logged()
+
+    async def _run(self):
+        """Background worker: wakes only when the earliest job is due."""
+        while True:
+            if not self._heap or self._heap[0][0] > time.time():
+                await self._sleep_until_due()
+                await self._refresh_logged()
+                continue
+
+            horizon = time.time() + (BATCH_WINDOW if self.run_batch is not None else 0)
+            due = self._pop_due(horizon)
+            if not due:
+                continue
+            failed = await self._execute(due)
+
+            now = time.time()
+            for key, job in due:
+                if key in failed:
+                    job["next_run"] = now + RETRY_DELAY
+                else:
+                    job["next_run"] += AUTO_LIKE_INTERVAL
+                # Never schedule in the past (e.g. after a long outage)
+                if job["next_run"] <= now:
+                    job["next_run"] = now + AUTO_LIKE_INTERVAL
+                if key in self.jobs:
+                    heapq.heappush(self._heap, (job["next_run"], key))
+            try:
+                await self.save([key for key, _ in due], skip_removed=True)
+            except Exception as e:
+                logger.error("Failed to save auto-like jobs", extra={"jobs": len(due), "error": str(e)})
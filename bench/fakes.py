@@ -0,0 +1,217 @@
+# bench/fakes.py
+import asyncio
+import hashlib
+import json
+import logging
+import random
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+from aiohttp import web
+
+
+class FakeServices:
+    """
+    One local aiohttp server standing in for every HTTP dependency of the bot:
+    the like API (GET /like), the auth API (GET /auth), the GitHub contents/commits API
+    (under /repos) and the Discord webhook (POST /webhook).
+    Latency is mean * uniform(0.5, 1.5); error rates are probabilities between 0 and 1.
+    """
+
+    def __init__(self, like_latency: float = 0.05, like_error_rate: float = 0.0, not_found_rate: float = 0.0,
+                 auth_latency: float = 0.02, auth_error_rate: float = 0.0, github_latency: float = 0.03,
+                 token_age_hours: float = 48):
+        self.like_latency = like_latency
+        self.like_error_rate = like_error_rate
+        self.not_found_rate = not_found_rate
+        self.auth_latency = auth_latency
+        self.auth_error_rate = auth_error_rate
+        self.github_latency = github_latency
+        self.token_age_hours = token_age_hours
+        self.calls = {"like": 0, "auth": 0, "github": 0, "webhook": 0}
+        self.files = {}         # path -> {"sha", "date"}
+        self.base_url = None
+        self._runner = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        # Clients disconnecting mid-request (cancelled pushes) are expected here, not worth a traceback
+        logging.getLogger("aiohttp.server").setLevel(logging.CRITICAL)
+        app = web.Application()
+        app.router.add_get("/like", self.like)
+        app.router.add_get("/auth", self.auth)
+        app.router.add_get("/repos/{owner}/{repo}/commits", self.commits)
+        app.router.add_get("/repos/{owner}/{repo}/contents/{path:.+}", self.get_contents)
+        app.router.add_put("/repos/{owner}/{repo}/contents/{path:.+}", self.put_contents)
+        app.router.add_post("/webhook", self.webhook)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{port}"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def reset_files(self):
+        """Forget pushed files, so every token file looks token_age_hours old again."""
+        self.files.clear()
+
+    @staticmethod
+    async def _delay(mean: float):
+        if mean > 0:
+            await asyncio.sleep(mean * random.uniform(0.5, 1.5))
+
+    async def like(self, request):
+        self.calls["like"] += 1
+        await self._delay(self.like_latency)
+        roll = random.random()
+        if roll < self.like_error_rate:
+            return web.Response(status=500, text="Internal Server Error")
+        if roll < self.like_error_rate + self.not_found_rate:
+            return web.Response(status=404, text="Player not found")
+        before = random.randint(0, 10000)
+        return web.json_response({
+            "status": 1,
+            "player": f"Player{request.query.get('uid', '')[-4:]}",
+            "region": request.query.get("server", "IND"),
+            "likes_before": before,
+            "likes_after": before + 100,
+            "likes_added": 100,
+        })
+
+    async def auth(self, request):
+        self.calls["auth"] += 1
+        await self._delay(self.auth_latency)
+        if random.random() < self.auth_error_rate:
+            return web.Response(status=500)
+        return web.json_response({"token": f"token-{request.query.get('uid')}-{random.getrandbits(32):08x}"})
+
+    def _file(self, path: str) -> dict:
+        default_date = datetime.now(timezone.utc) - timedelta(hours=self.token_age_hours)
+        return self.files.get(path) or {"sha": hashlib.sha1(path.encode()).hexdigest(), "date": default_date}
+
+    def _github_response(self, request, body):
+        """JSON response with an ETag, answering 304 when the client already has it."""
+        etag = '"' + hashlib.sha1(json.dumps(body, sort_keys=True).encode()).hexdigest() + '"'
+        headers = {"ETag": etag, "X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": "0"}
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers=headers)
+        return web.json_response(body, headers=headers)
+
+    async def commits(self, request):
+        self.calls["github"] += 1
+        await self._delay(self.github_latency)
+        path = request.query.get("path", "")
+        if path == "tokens":
+            # Directory history: the most recent commit among the token files
+            dates = [f["date"] for p, f in self.files.items() if p.startswith("tokens/")]
+            date = max(dates) if dates else datetime.now(timezone.utc) - timedelta(hours=self.token_age_hours)
+        else:
+            date = self._file(path)["date"]
+        body = [{"sha": hashlib.sha1(date.isoformat().encode()).hexdigest(),
+                 "commit": {"committer": {"date": date.strftime("%Y-%m-%dT%H:%M:%SZ")}}}]
+        return self._github_response(request, body)
+
+    async def get_contents(self, request):
+        self.calls["github"] += 1
+        await self._delay(self.github_latency)
+        return self._github_response(request, {"sha": self._file(request.match_info["path"])["sha"], "download_url": None})
+
+    async def put_contents(self, request):
+        self.calls["github"] += 1
+        await self._delay(self.github_latency)
+        path = request.match_info["path"]
+        try:
+            data = await request.json()
+        except ConnectionResetError:
+            # The client gave up (e.g. a bench reset cancelled the push): nothing to answer
+            return web.Response(status=499)
+        current = self._file(path)
+        if data.get("sha") and data["sha"] != current["sha"]:
+            return web.json_response({"message": "sha mismatch"}, status=409)
+        sha = hashlib.sha1(data["content"].encode()).hexdigest()
+        self.files[path] = {"sha": sha, "date": datetime.now(timezone.utc)}
+        return web.json_response({"content": {"sha": sha}}, status=200)
+
+    async def webhook(self, request):
+        self.calls["webhook"] += 1
+        await request.read()
+        return web.Response(status=204)
+
+
+# --- Discord stand-ins ---
+
+class FakeGuild:
+    def __init__(self, guild_id: int):
+        self.id = guild_id
+
+
+class FakeChannel:
+    """Text channel that records sends. Each send takes send_latency seconds, like a REST call."""
+
+    def __init__(self, channel_id: int, guild: FakeGuild, send_latency: float = 0.0):
+        self.id = channel_id
+        self.guild = guild
+        self.name = f"bench-{channel_id}"
+        self.mention = f"<#{channel_id}>"
+        self.send_latency = send_latency
+        self.sent = 0
+
+    async def send(self, content=None, **kwargs):
+        if self.send_latency:
+            await asyncio.sleep(self.send_latency)
+        self.sent += 1
+
+
+class FakeAuthor:
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.display_name = f"user{user_id}"
+        self.mention = f"<@{user_id}>"
+
+
+class FakeCommand:
+    def __init__(self, name: str):
+        self.name = name
+
+
+class FakeContext:
+    """Prefix-command context (no interaction): send and reply go to the channel."""
+
+    def __init__(self, channel: FakeChannel, author: FakeAuthor, command: str = "like"):
+        self.channel = channel
+        self.guild = channel.guild
+        self.author = author
+        self.command = FakeCommand(command)
+        self.interaction = None
+
+    async def send(self, content=None, **kwargs):
+        await self.channel.send(content, **kwargs)
+
+    async def reply(self, content=None, **kwargs):
+        await self.channel.send(content, **kwargs)
+
+    @asynccontextmanager
+    async def typing(self):
+        yield
+
+
+class FakeBot:
+    def __init__(self, channels):
+        self.channels = {channel.id: channel for channel in channels}
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+
+def make_channels(guilds: int, channels_per_guild: int = 1, send_latency: float = 0.0) -> list:
+    channels = []
+    for g in range(guilds):
+        guild = FakeGuild(1000 + g)
+        for c in range(channels_per_guild):
+            channels.append(FakeChannel(guild.id * 100 + c, guild, send_latency))
+    return channels
@@ -0,0 +1,115 @@
+# bench/harness.py
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+
+import state_backend
+import token_manager
+import webhook_notifier
+from guild_config import GuildConfigStore
+from token_store import TokenStore
+from http_client import get_session, close_session
+from like_api import LikeApiClient
+from cogs.likeCommands import LikeCommands
+
+from bench.fakes import FakeServices, FakeBot, make_channels
+
+
+class BenchEnvironment:
+    """
+    Wires the bot's real code to FakeServices: a LikeCommands cog on a FakeBot, and
+    token_manager pointed at the fake GitHub/auth/webhook with configs in a temporary directory.
+    Use as `async with BenchEnvironment(services) as env:`.
+    """
+
+    def __init__(self, services: FakeServices, guilds: int = 10, channels_per_guild: int = 1,
+                 send_latency: float = 0.0, accounts: int = token_manager.ROTATION_BATCH):
+        self.services = services
+        self.channels = make_channels(guilds, channels_per_guild, send_latency)
+        self.accounts = accounts
+        self.workdir = None
+        self.bot = None
+        self.cog = None
+        self.session = None
+        self._stores = 0
+        self._state_backend = None
+
+    async def __aenter__(self):
+        base_url = await self.services.start()
+        self.workdir = tempfile.mkdtemp(prefix="seemu-bench-")
+        self.session = get_session()
+
+        # Keep the cog away from the real like_channels.json, auto_likes.json and STATE_BACKEND
+        self._state_backend = (state_backend.STATE_BACKEND, state_backend._backend)
+        state_backend.STATE_BACKEND, state_backend._backend = None, None
+        self.bot = FakeBot(self.channels)
+        self.cog = LikeCommands(self.bot)
+        self.cog.guild_config.close()
+        self.cog.guild_config = GuildConfigStore(os.path.join(self.workdir, "like_channels.json"),
+                                                 os.path.join(self.workdir, "like_channels.log"))
+        self.cog.auto_like_scheduler.path = os.path.join(self.workdir, "auto_likes.json")
+        self.cog.like_api = LikeApiClient(base_url, self.session, self.cog.like_api.admission)
+        self.cog.dispatcher.start()
+
+        config_dir = os.path.join(self.workdir, "configs")
+        os.makedirs(config_dir)
+        for zone in token_manager.ZONES:
+            accounts = [{"uid": str(3000000000 + i), "password": f"bench-{i}"} for i in range(self.accounts)]
+            with open(os.path.join(config_dir, f"config_{zone}.json"), "w") as f:
+                json.dump(accounts, f)
+        token_manager.GITHUB_API = base_url
+        token_manager.REPO_TOKENS = "bench/tokens"
+        token_manager.AUTH_URL = f"{base_url}/auth"
+        token_manager.LOCAL_CONFIG_DIR = config_dir
+        token_manager.notifier.url = f"{base_url}/webhook"
+        await self.reset_tokens()
+        return self
+
+    async def __aexit__(self, *exc):
+        self.cog.dispatcher.stop()
+        self.cog.guild_config.close()
+        for task in token_manager.zone_refresh_tasks.values():
+            task.cancel()
+        await self._stop_syncs(token_manager.token_store)
+        state_backend.STATE_BACKEND, state_backend._backend = self._state_backend
+        # Longer than the notifier's batching delay, so the last notifications are flushed
+        await token_manager.notifier.close(timeout=webhook_notifier.BATCH_DELAY + 1)
+        await close_session()
+        await self.services.stop()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    @staticmethod
+    async def _stop_syncs(store: TokenStore, zones=None):
+        """Cancel the store's background pushes and wait for them, so none outlives a reset."""
+        tasks = [task for zone, task in store._sync_tasks.items() if zones is None or zone in zones]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for zone in list(store._sync_tasks):
+            if zones is None or zone in zones:
+                del store._sync_tasks[zone]
+                store._dirty.discard(zone)
+
+    async def reset_tokens(self):
+        """Start from an empty token store, as on a first boot, so every account is due."""
+        await self._stop_syncs(token_manager.token_store)
+        self._stores += 1
+        token_manager.token_store = TokenStore(token_manager.push_zone_tokens, token_manager.fetch_zone_sha,
+                                               os.path.join(self.workdir, f"tokens-{self._stores}"))
+        token_manager.zone_refresh_tasks.clear()
+        token_manager.github_cache.clear()
+        for zone in token_manager.ZONES:
+            token_manager.last_commit_times[zone] = None
+            token_manager.zone_retry_at[zone] = None
+        self.services.reset_files()
+
+    async def reset_zone(self, zone: str):
+        """Forget one zone's local tokens so its next refresh renews a full batch."""
+        store = token_manager.token_store
+        await self._stop_syncs(store, [zone])
+        store.zones.pop(zone, None)
+        path = os.path.join(store.directory, f"{zone}.json")
+        if os.path.exists(path):
+            os.remove(path)
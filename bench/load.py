@@ -0,0 +1,200 @@
+# bench/load.py
+"""
+Synthetic load: replays a weighted mix of command traffic against the cog in-process, ramping
+the number of concurrent virtual users until latency climbs, then reports the saturation knee.
+
+    python -m bench.load --mix like=70,like_cached=15,cooldown=10,invalid=5 --max-users 512
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import time
+
+from bench.fakes import FakeContext, FakeAuthor
+from bench.harness import BenchEnvironment
+from bench.run import make_services
+from bench.stats import LoopLagSampler, percentile
+
+DEFAULT_MIX = "like=70,like_cached=15,cooldown=10,invalid=5"
+HOT_UIDS = 20               # UIDs shared by like_cached traffic (served from the like API cache)
+COOLDOWN_USERS = 50         # Users repeating /like, so most of their calls hit the cooldown
+KNEE_FACTOR = 2.0           # p99 this many times the baseline p99 marks the knee
+MIN_SCALING = 1.1           # ...as does throughput growing less than this when users double
+SAMPLE_INTERVAL = 0.05      # Seconds between two queue-depth samples
+
+
+class TrafficMix:
+    """Operations picked at random with the given weights, each a coroutine taking the environment."""
+
+    def __init__(self, spec: str):
+        self.weights = {}
+        for part in spec.split(","):
+            name, _, weight = part.partition("=")
+            name = name.strip()
+            if name not in OPERATIONS:
+                raise ValueError(f"unknown operation '{name}', expected one of: {', '.join(OPERATIONS)}")
+            self.weights[name] = float(weight or 1)
+        self._names = list(self.weights)
+        self._cumulative = list(itertools.accumulate(self.weights.values()))
+
+    def pick(self) -> str:
+        return random.choices(self._names, cum_weights=self._cumulative)[0]
+
+
+_user_ids = itertools.count(100_000)
+_uids = itertools.count(300_000)
+
+
+async def op_like(env):
+    ctx = FakeContext(random.choice(env.channels), FakeAuthor(next(_user_ids)))
+    await env.cog.like_command.callback(env.cog, ctx, "IND", str(next(_uids)))
+
+
+async def op_like_cached(env):
+    ctx = FakeContext(random.choice(env.channels), FakeAuthor(next(_user_ids)))
+    await env.cog.like_command.callback(env.cog, ctx, "IND", str(100_000 + random.randrange(HOT_UIDS)))
+
+
+async def op_cooldown(env):
+    ctx = FakeContext(random.choice(env.channels), FakeAuthor(random.randrange(COOLDOWN_USERS)))
+    await env.cog.like_command.callback(env.cog, ctx, "BD", str(next(_uids)))
+
+
+async def op_invalid(env):
+    ctx = FakeContext(random.choice(env.channels), FakeAuthor(next(_user_ids)))
+    await env.cog.like_command.callback(env.cog, ctx, "IND", "12ab")
+
+
+async def op_auto_like(env):
+    channel = random.choice(env.channels)
+    await env.cog.send_auto_like(str(next(_uids)), "BR", channel.id, next(_user_ids))
+
+
+OPERATIONS = {
+    "like": op_like,
+    "like_cached": op_like_cached,
+    "cooldown": op_cooldown,
+    "invalid": op_invalid,
+    "auto_like": op_auto_like,
+}
+
+
+async def run_step(env, mix: TrafficMix, users: int, duration: float) -> dict:
+    """Closed loop: `users` virtual users each issue one command after another for `duration` seconds."""
+    latencies = []
+    errors = 0
+    peaks = {"admission_queue": 0, "dispatcher_queue": 0}
+    deadline = time.perf_counter() + duration
+
+    async def user():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                await OPERATIONS[mix.pick()](env)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    async def sample():
+        while True:
+            peaks["admission_queue"] = max(peaks["admission_queue"], env.cog.like_api.admission.queued)
+            peaks["dispatcher_queue"] = max(peaks["dispatcher_queue"], env.cog.dispatcher.stats()["queued"])
+            await asyncio.sleep(SAMPLE_INTERVAL)
+
+    sampler = LoopLagSampler()
+    sampler.start()
+    sampler_task = asyncio.create_task(sample())
+    start = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(users)))
+    elapsed = time.perf_counter() - start
+    sampler_task.cancel()
+    await sampler.stop()
+
+    return {
+        "users": users,
+        "calls": len(latencies),
+        "errors": errors,
+        "throughput": len(latencies) / elapsed,
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+        "lag_p99": percentile(sampler.samples, 99),
+        **peaks,
+    }
+
+
+def find_knee(steps: list) -> dict | None:
+    """First step where p99 latency exceeds KNEE_FACTOR x the baseline or throughput stops scaling."""
+    if not steps:
+        return None
+    baseline = steps[0]["p99"]
+    for previous, step in zip(steps, steps[1:]):
+        if step["p99"] > baseline * KNEE_FACTOR:
+            return step
+        if step["throughput"] < previous["throughput"] * MIN_SCALING:
+            return step
+    return None
+
+
+def format_report(steps: list, knee: dict | None) -> str:
+    lines = [f"{'users':>6} {'calls':>7} {'errors':>6} {'ops/s':>9} {'p50 ms':>8} {'p99 ms':>8} "
+             f"{'lag p99':>8} {'adm q':>6} {'send q':>6}"]
+    for s in steps:
+        marker = "  <- knee" if s is knee else ""
+        lines.append(f"{s['users']:>6} {s['calls']:>7} {s['errors']:>6} {s['throughput']:>9.1f} "
+                     f"{s['p50'] * 1000:>8.1f} {s['p99'] * 1000:>8.1f} {s['lag_p99'] * 1000:>8.1f} "
+                     f"{s['admission_queue']:>6} {s['dispatcher_queue']:>6}{marker}")
+    if knee is None:
+        lines.append("No saturation point reached; increase --max-users.")
+    else:
+        lines.append(f"Saturation at ~{knee['users']} concurrent users: {knee['throughput']:.1f} ops/s, "
+                     f"p99 {knee['p99'] * 1000:.1f} ms")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Ramp synthetic command traffic until the bot saturates")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"weighted operations, from: {', '.join(OPERATIONS)}")
+    parser.add_argument("--start-users", type=int, default=1)
+    parser.add_argument("--max-users", type=int, default=256)
+    parser.add_argument("--step-duration", type=float, default=5, help="seconds per ramp step")
+    parser.add_argument("--guilds", type=int, default=50)
+    parser.add_argument("--restricted-guilds", type=float, default=0.5,
+                        help="share of guilds with a /like channel restriction")
+    parser.add_argument("--latency", type=float, default=0.05, help="mean like API latency (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="like API 5xx probability")
+    parser.add_argument("--not-found-rate", type=float, default=0.0, help="like API 404 probability")
+    parser.add_argument("--auth-latency", type=float, default=0.02)
+    parser.add_argument("--github-latency", type=float, default=0.03)
+    parser.add_argument("--send-latency", type=float, default=0.02, help="Discord send latency (s)")
+    parser.add_argument("--output", help="also append the report to this file")
+    return parser.parse_args(argv)
+
+
+async def main(args) -> str:
+    mix = TrafficMix(args.mix)
+    async with BenchEnvironment(make_services(args), guilds=args.guilds, channels_per_guild=2,
+                                send_latency=args.send_latency) as env:
+        # Restrict /like to the first channel in some guilds, so check_channel does real lookups
+        for channel in env.channels[:int(len(env.channels) * args.restricted_guilds)]:
+            if channel.id % 100 == 0:
+                env.cog.guild_config.channels.setdefault(str(channel.guild.id), set()).add(str(channel.id))
+
+        steps = []
+        users = args.start_users
+        while users <= args.max_users:
+            print(f"⏱️ {users} concurrent users...")
+            steps.append(await run_step(env, mix, users, args.step_duration))
+            users *= 2
+
+    return format_report(steps, find_knee(steps))
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = asyncio.run(main(args))
+    print(report)
+    if args.output:
+        with open(args.output, "a") as f:
+            f.write(report + "\n")
@@ -0,0 +1,137 @@
+# bench/run.py
+"""
+Offline benchmarks. Every external service is replaced by bench.fakes, so this runs headless:
+
+    python -m bench.run --scenario all --requests 1000 --concurrency 50 --latency 0.05
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import token_manager
+
+from bench.fakes import FakeServices, FakeContext, FakeAuthor
+from bench.harness import BenchEnvironment
+from bench.stats import HEADER, drive
+
+SCENARIOS = ("like_command", "send_auto_like", "refresh_zone", "check_token_validity")
+REFRESH_TIMEOUT = 60    # Seconds a check_token_validity pass may take before it counts as an error
+STOP_TIMEOUT = 5        # Seconds the refresh loop may take to exit once cancelled
+
+
+async def bench_like_command(env: BenchEnvironment, args) -> list:
+    cog = env.cog
+
+    async def operation(i):
+        # A distinct author per call, so the per-user cooldown never short-circuits the request
+        ctx = FakeContext(random.choice(env.channels), FakeAuthor(10_000 + i))
+        uid = str(100000 + i % args.unique_uids)
+        await cog.like_command.callback(cog, ctx, "IND", uid)
+
+    return [await drive("like_command", operation, args.requests, args.concurrency)]
+
+
+async def bench_send_auto_like(env: BenchEnvironment, args) -> list:
+    cog = env.cog
+
+    async def operation(i):
+        channel = random.choice(env.channels)
+        uid = str(200000 + i % args.unique_uids)
+        await cog.send_auto_like(uid, random.choice(("IND", "BD", "BR")), channel.id, 10_000 + i)
+
+    return [await drive("send_auto_like", operation, args.requests, args.concurrency)]
+
+
+async def bench_refresh_zone(env: BenchEnvironment, args) -> list:
+    zones = token_manager.ZONES
+
+    async def operation(i):
+        zone = zones[i % len(zones)]
+        await env.reset_zone(zone)
+        if not await token_manager.refresh_zone(env.session, zone):
+            raise RuntimeError(f"refresh of {zone} failed")
+
+    # One refresh per zone at a time, as in production
+    count = max(len(zones), args.requests // 20)
+    return [await drive("refresh_zone", operation, count, min(args.concurrency, len(zones)))]
+
+
+async def bench_check_token_validity(env: BenchEnvironment, args) -> list:
+    """Time from a cold start of the refresh scheduler until every stale zone has been renewed."""
+
+    async def operation(i):
+        await env.reset_tokens()
+        loop_task = asyncio.create_task(token_manager.check_token_validity(env.session))
+        deadline = time.monotonic() + REFRESH_TIMEOUT
+        try:
+            while True:
+                tasks = token_manager.zone_refresh_tasks
+                if all(zone in tasks and tasks[zone].done() for zone in token_manager.ZONES):
+                    break
+                if time.monotonic() > deadline:
+                    raise TimeoutError("zones not refreshed in time")
+                await asyncio.sleep(0.005)
+        finally:
+            loop_task.cancel()
+            done, _ = await asyncio.wait({loop_task}, timeout=STOP_TIMEOUT)
+            if not done:
+                raise TimeoutError("check_token_validity ignored its cancellation")
+            if not loop_task.cancelled() and loop_task.exception() is not None:
+                raise loop_task.exception()
+
+    return [await drive("check_token_validity", operation, max(1, args.requests // 100), 1)]
+
+
+BENCHMARKS = {
+    "like_command": bench_like_command,
+    "send_auto_like": bench_send_auto_like,
+    "refresh_zone": bench_refresh_zone,
+    "check_token_validity": bench_check_token_validity,
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks against local fake services")
+    parser.add_argument("--scenario", choices=SCENARIOS + ("all",), default="all")
+    parser.add_argument("--requests", type=int, default=500, help="calls per scenario")
+    parser.add_argument("--concurrency", type=int, default=50, help="calls in flight")
+    parser.add_argument("--latency", type=float, default=0.05, help="mean like API latency (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="like API 5xx probability")
+    parser.add_argument("--not-found-rate", type=float, default=0.0, help="like API 404 probability")
+    parser.add_argument("--auth-latency", type=float, default=0.02, help="mean auth API latency (s)")
+    parser.add_argument("--github-latency", type=float, default=0.03, help="mean GitHub API latency (s)")
+    parser.add_argument("--send-latency", type=float, default=0.0, help="Discord send latency (s)")
+    parser.add_argument("--unique-uids", type=int, default=1000, help="distinct UIDs (fewer = more cache hits)")
+    parser.add_argument("--guilds", type=int, default=10)
+    parser.add_argument("--output", help="also append the report to this file")
+    return parser.parse_args(argv)
+
+
+def make_services(args) -> FakeServices:
+    return FakeServices(like_latency=args.latency, like_error_rate=args.error_rate,
+                        not_found_rate=args.not_found_rate, auth_latency=args.auth_latency,
+                        github_latency=args.github_latency)
+
+
+async def main(args) -> str:
+    services = make_services(args)
+    scenarios = SCENARIOS if args.scenario == "all" else (args.scenario,)
+    results = []
+    async with BenchEnvironment(services, guilds=args.guilds, send_latency=args.send_latency) as env:
+        for name in scenarios:
+            print(f"⏱️ Running {name}...")
+            results.extend(await BENCHMARKS[name](env, args))
+
+    lines = [HEADER] + [result.row() for result in results]
+    lines.append(f"upstream calls: {services.calls}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = asyncio.run(main(args))
+    print(report)
+    if args.output:
+        with open(args.output, "a") as f:
+            f.write(report + "\n")
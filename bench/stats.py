@@ -0,0 +1,87 @@
+# bench/stats.py
+import asyncio
+import time
+
+LAG_SAMPLE_INTERVAL = 0.01  # Seconds between two event-loop lag samples while benchmarking
+
+
+def percentile(values: list, p: float) -> float:
+    """Nearest-rank percentile of an unsorted list (0 if empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class LoopLagSampler:
+    """Samples how late the event loop wakes up from a short sleep, for the duration of a run."""
+
+    def __init__(self, interval: float = LAG_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.samples = []
+        self._task = None
+
+    def start(self):
+        self.samples = []
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - start - self.interval))
+
+
+class Result:
+    def __init__(self, name: str, latencies: list, errors: int, elapsed: float, lag: list):
+        self.name = name
+        self.latencies = latencies
+        self.errors = errors
+        self.elapsed = elapsed
+        self.lag = lag
+
+    @property
+    def throughput(self) -> float:
+        return len(self.latencies) / self.elapsed if self.elapsed else 0.0
+
+    def row(self) -> str:
+        return (f"{self.name:<24} {len(self.latencies):>7} {self.errors:>6} {self.throughput:>10.1f} "
+                f"{percentile(self.latencies, 50) * 1000:>9.1f} {percentile(self.latencies, 99) * 1000:>9.1f} "
+                f"{percentile(self.lag, 99) * 1000:>10.1f} {max(self.lag, default=0) * 1000:>10.1f}")
+
+
+HEADER = (f"{'scenario':<24} {'calls':>7} {'errors':>6} {'ops/s':>10} "
+          f"{'p50 ms':>9} {'p99 ms':>9} {'lag p99 ms':>10} {'lag max ms':>10}")
+
+
+async def drive(name: str, operation, count: int, concurrency: int) -> Result:
+    """Run operation(i) for i in range(count) with at most `concurrency` in flight."""
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    sampler = LoopLagSampler()
+
+    async def one(i):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await operation(i)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    sampler.start()
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(count)))
+    elapsed = time.perf_counter() - start
+    await sampler.stop()
+    return Result(name, latencies, errors, elapsed, sampler.samples)
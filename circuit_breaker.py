@@ -0,0 +1,118 @@
+# circuit_breaker.py
+import logging
+import math
+import os
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+BREAKER_FAILURES = int(os.getenv("BREAKER_FAILURES", 5))            # Consecutive failures before opening
+BREAKER_OPEN_SECONDS = int(os.getenv("BREAKER_OPEN_SECONDS", 30))   # Time spent open before probing
+BREAKER_PROBES = int(os.getenv("BREAKER_PROBES", 2))                # Successful probes needed to close
+SLOW_CALL_SECONDS = float(os.getenv("SLOW_CALL_SECONDS", 8))        # Slower calls count as failures
+
+TIMEOUT_MIN = float(os.getenv("LIKE_TIMEOUT_MIN", 3))
+TIMEOUT_MAX = float(os.getenv("LIKE_TIMEOUT_MAX", 20))
+TIMEOUT_MULTIPLIER = 2      # Timeout = p99 latency * multiplier, clamped to [TIMEOUT_MIN, TIMEOUT_MAX]
+LATENCY_WINDOW = 200        # Latency samples kept per region
+MIN_SAMPLES = 20            # Below this, TIMEOUT_MAX is used
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because the circuit is open."""
+
+    def __init__(self, name: str, retry_after: int):
+        super().__init__(f"Circuit '{name}' is open, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class LatencyTracker:
+    """Rolling window of call latencies used to derive an adaptive timeout."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.samples = deque(maxlen=window)
+
+    def record(self, latency: float):
+        self.samples.append(latency)
+
+    def percentile(self, q: float) -> float | None:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)
+        return ordered[max(0, index)]
+
+    def timeout(self) -> float:
+        if len(self.samples) < MIN_SAMPLES:
+            return TIMEOUT_MAX
+        return min(TIMEOUT_MAX, max(TIMEOUT_MIN, self.percentile(0.99) * TIMEOUT_MULTIPLIER))
+
+
+class CircuitBreaker:
+    """
+    closed -> open after BREAKER_FAILURES consecutive failures or slow calls.
+    open -> half_open after BREAKER_OPEN_SECONDS; up to BREAKER_PROBES calls are let through.
+    half_open -> closed once every probe succeeds, back to open on any failure.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes_in_flight = 0
+        self.probe_successes = 0
+        self.latency = LatencyTracker()
+
+    def allow(self):
+        """Reserve permission for one call, or raise CircuitOpenError."""
+        if self.state == "open":
+            remaining = self.opened_at + BREAKER_OPEN_SECONDS - time.monotonic()
+            if remaining > 0:
+                raise CircuitOpenError(self.name, math.ceil(remaining))
+            self.state = "half_open"
+            self.probes_in_flight = 0
+            self.probe_successes = 0
+
+        if self.state == "half_open":
+            if self.probes_in_flight + self.probe_successes >= BREAKER_PROBES:
+                raise CircuitOpenError(self.name, 1)
+            self.probes_in_flight += 1
+
+    def record(self, latency: float, ok: bool):
+        """Report the outcome of a call that was allowed."""
+        if ok:
+            self.latency.record(latency)
+        ok = ok and latency <= SLOW_CALL_SECONDS
+
+        if self.state == "half_open":
+            self.probes_in_flight = max(0, self.probes_in_flight - 1)
+            if not ok:
+                self._open()
+            else:
+                self.probe_successes += 1
+                if self.probe_successes >= BREAKER_PROBES:
+                    self.state = "closed"
+                    self.failures = 0
+                    logger.info("✅ Circuit %s closed", self.name)
+            return
+
+        if ok:
+            self.failures = 0
+        else:
+            self.failures += 1
+            if self.failures >= BREAKER_FAILURES:
+                self._open()
+
+    def release(self):
+        """Give back the permission of a call that was abandoned (e.g. cancelled) without an outcome."""
+        if self.state == "half_open":
+            self.probes_in_flight = max(0, self.probes_in_flight - 1)
+
+    def _open(self):
+        self.state = "open"
+        self.opened_at = time.monotonic()
+        self.failures = 0
+        logger.warning("⚠️ Circuit %s opened", self.name)
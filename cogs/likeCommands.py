@@ -1,173 +1,228 @@
 import discord
 from discord.ext import commands, tasks
 from discord import app_commands
-import aiohttp
 from datetime import datetime, timedelta
-import json
 import os
 import asyncio
 from dotenv import load_dotenv
+from auto_like_scheduler import AutoLikeScheduler
+from http_client import get_session
+from like_api import LikeApiClient
+from admission import AdmissionRejected
+from circuit_breaker import CircuitOpenError
+import metrics
+import time
+from cooldowns import CooldownTracker
+from guild_config import GuildConfigStore, CONFIG_FILE
+from dispatcher import MessageDispatcher
+import state_backend
+import settings
+import embeds
+import logs
+import logging
 
 load_dotenv()
-API_URL=os.getenv("API_URL")
-CONFIG_FILE = "like_channels.json"
+AUTO_LIKE_BATCH = os.getenv("AUTO_LIKE_BATCH", "1") == "1"            # Group due auto-likes per region/channel
+AUTO_LIKE_PARALLELISM = int(os.getenv("AUTO_LIKE_PARALLELISM", 5))    # Like API calls in flight per region batch
+COMMAND_LOG_SAMPLE = float(os.getenv("COMMAND_LOG_SAMPLE", 0.1))      # Share of completed commands that are logged
+
+logger = logging.getLogger(__name__)
 
 class LikeCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.api_host =API_URL
-        self.config_data = self.load_config()
-        self.cooldowns = {}
-        self.session = aiohttp.ClientSession()
-        self.auto_like_tasks = {}  # Store auto-like tasks
-
-
-    def load_config(self):
-        default_config = {
-            "servers": {}
-        }
-        if os.path.exists(CONFIG_FILE):
-            try:
-                with open(CONFIG_FILE, 'r') as f:
-                    loaded_config = json.load(f)
-                    loaded_config.setdefault("servers", {})
-                    return loaded_config
-            except json.JSONDecodeError:
-                print(f"WARNING: The configuration file '{CONFIG_FILE}' is corrupt or empty. Resetting to default configuration.")
-        self.save_config(default_config)
-        return default_config
-
-    def save_config(self, config_to_save=None):
-        data_to_save = config_to_save if config_to_save is not None else self.config_data
-        temp_file = CONFIG_FILE + ".tmp"
-        with open(temp_file, 'w') as f:
-            json.dump(data_to_save, f, indent=4)
-        os.replace(temp_file, CONFIG_FILE)
+        self.backend = state_backend.get_async_backend()
+        self.guild_config = GuildConfigStore(backend=self.backend)
+        self.cooldowns = CooldownTracker(command_limits={"like": 30}, backend=self.backend)
+        self.session = get_session()
+        self.like_api = LikeApiClient(settings.current().api_url, self.session, backend=self.backend)
+        self.dispatcher = MessageDispatcher()
+        if AUTO_LIKE_BATCH:
+            self.auto_like_scheduler = AutoLikeScheduler(run_batch=self.run_auto_like_batch, backend=self.backend)
+        else:
+            self.auto_like_scheduler = AutoLikeScheduler(self.run_auto_like_job, backend=self.backend)
+
+        metrics.AUTO_LIKE_JOBS.set_function(lambda: len(self.auto_like_scheduler.jobs))
+        metrics.LIKE_API_IN_FLIGHT.set_function(lambda: self.like_api.admission.active)
+        metrics.LIKE_API_QUEUE_DEPTH.set_function(lambda: self.like_api.admission.queued)
+        metrics.LIKE_API_QUEUE_WAIT.set_function(lambda: self.like_api.admission.avg_wait)
+        metrics.OUTBOUND_QUEUE_DEPTH.set_function(lambda: self.dispatcher.stats()["queued"])
+        metrics.OUTBOUND_DROPPED.set_function(lambda: self.dispatcher.dropped)
+
 
     async def check_channel(self, ctx):
         if ctx.guild is None:
             return True
-        guild_id = str(ctx.guild.id)
-        like_channels = self.config_data["servers"].get(guild_id, {}).get("like_channels", [])
-        return not like_channels or str(ctx.channel.id) in like_channels
+        return self.guild_config.is_allowed(ctx.guild.id, ctx.channel.id)
+
+    async def cog_before_invoke(self, ctx):
+        ctx.started_at = time.perf_counter()
+        logs.new_correlation_id()
+
+    async def cog_after_invoke(self, ctx):
+        started_at = getattr(ctx, "started_at", None)
+        if started_at is not None:
+            elapsed = time.perf_counter() - started_at
+            metrics.COMMAND_LATENCY.observe(elapsed, command=ctx.command.name)
+            logger.info("Command completed", extra=logs.sampled(
+                COMMAND_LOG_SAMPLE, command=ctx.command.name, latency=round(elapsed, 4),
+                guild_id=ctx.guild.id if ctx.guild else None, user_id=ctx.author.id))
 
     async def cog_load(self):
-        pass
+        await self.auto_like_scheduler.load()
+        # In sharded mode only the leader worker runs the jobs; the others only add, remove and list them
+        if getattr(self.bot, "is_leader", True):
+            self.auto_like_scheduler.start()
+        else:
+            self.auto_like_scheduler.start_sync()
+        self.dispatcher.start()
+        settings.on_change(self.apply_settings)
+        if self.backend is None:
+            settings.watcher.watch(CONFIG_FILE, self.guild_config.reload)
+        else:
+            await self.guild_config.start()
 
-    def get_server_flag(self, server):
-        """Get flag emoji for server region"""
-        flags = {
-            "IND": "🇮🇳",  # India
-            "BD": "🇧🇩",   # Bangladesh
-            "BR": "🇧🇷"    # Brazil
-        }
-        return flags.get(server.upper(), "🌍")
+    def apply_settings(self, old, new):
+        """Settings listener: point new like requests at the reloaded API URL."""
+        if new.api_url != old.api_url:
+            # Requests already in flight finish on the previous client; admission is shared
+            self.like_api = LikeApiClient(new.api_url, self.session, self.like_api.admission, self.backend)
 
     def format_server_with_flag(self, server):
         """Format server name with flag"""
-        flag = self.get_server_flag(server)
-        return f"{server} {flag}"
+        return embeds.format_server_with_flag(server)
+
+    def get_channel(self, channel_id):
+        """
+        Channel to post auto-like results in. A worker only caches its own shards' guilds,
+        so other channels are reached through a partial messageable (REST only).
+        """
+        channel = self.bot.get_channel(channel_id)
+        if channel is None and getattr(self.bot, "worker_count", 1) > 1:
+            channel = self.bot.get_partial_messageable(channel_id)
+        return channel
 
     async def send_auto_like(self, uid, server, channel_id, user_id):
         """Send automatic like for auto-like command"""
         try:
-            url = f"{self.api_host}/like?uid={uid}&server={server}"
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    channel = self.bot.get_channel(channel_id)
-                    if channel:
-                        embed = discord.Embed(
-                            title="🔄 AUTO LIKE SUCCESFULLY SENDED",
-                            color=0x2ECC71 if data.get("status") == 1 else 0xE74C3C,
-                            timestamp=datetime.now()
-                        )
-                        
-                        if data.get("status") == 1:
-                            # Create a more visually appealing embed for auto-like
-                            embed.title = "🔄 AUTO LIKE SUCCESFULLY SENDED"
-                            embed.description = (
-                                "✅ Auto-like delivered successfully!\n"
-                                "✨ Perfect execution!"
-                            )
-                            
-                            # Player Info Section
-                            embed.add_field(
-                                name="👤 Player Info",
-                                value=f"```\n[UID]     {uid}\n[Name]    {data.get('player', 'Unknown')}```",
-                                inline=True
-                            )
-                            
-                            # Server Region Section
-                            embed.add_field(
-                                name="🌐 Server Region",
-                                value=f"```\n{self.format_server_with_flag(data.get('region', 'Unknown'))} Server```",
-                                inline=True
-                            )
-                            
-                            # Like Stats Section
-                            likes_before = data.get('likes_before', 0)
-                            likes_after = data.get('likes_after', 0)
-                            likes_added = data.get('likes_added', 0)
-                            
-                            embed.add_field(
-                                name="📊 Like Stats",
-                                value=f"```\nBefore: {likes_before} likes\nAfter:  {likes_after} likes\nAdded:  {likes_added} likes```",
-                                inline=False
-                            )
-                            
-                            
-                            # Promotional Banner
-                            embed.add_field(
-                                name="",
-                                value="**INSTANT DELIVERY**",
-                                inline=False
-                            )
-                        else:
-                            embed.description = "This UID has already received the maximum likes today.\nAuto-like will try again in 24 hours."
-                        
-                        embed.set_footer(text=f"🔹 Auto-like executed • DEVOLOPED BY UNKNOWN X!TER")
-                        embed.set_image(url="https://ibb.co.com/TM4kTbck")
-                        file = discord.File("assets/banned.gif", filename="banned.gif")
-                        embed.set_image(url="attachment://banned.gif")
-                        await channel.send(f"<@{user_id}>", embed=embed)
-        except Exception as e:
-            print(f"Error in auto-like for UID {uid}: {e}")
-
-    async def auto_like_loop(self, uid, server, channel_id, user_id):
-        """Background loop for auto-like functionality"""
-        while True:
+            channel = self.get_channel(channel_id)
+            guild_id = channel.guild.id if channel and getattr(channel, "guild", None) else None
+            status, data = await self.like_api.fetch(uid, server, guild_id)
+            if status == 200:
+                if channel:
+                    embed = embeds.like_result(data, uid, "🔹 Auto-like executed • DEVOLOPED BY UNKNOWN X!TER", auto=True)
+                    self.dispatcher.background(channel, f"<@{user_id}>", [embed], files=embeds.attachments)
+        except (AdmissionRejected, CircuitOpenError):
+            raise  # Let the scheduler retry the job later
+        except Exception:
+            logger.exception("Error in auto-like", extra={"uid": uid, "server": server})
+
+    async def run_auto_like_job(self, job):
+        """Scheduler callback for a due auto-like job"""
+        logs.new_correlation_id()
+        await self.send_auto_like(job["uid"], job["server"], job["channel_id"], job["user_id"])
+
+    async def run_auto_like_batch(self, jobs):
+        """
+        Scheduler callback in batch mode: like every due job, grouped by region with bounded
+        parallelism, then post one summary per channel. Returns the jobs to retry later.
+        """
+        logs.new_correlation_id()
+        by_region = {}
+        for job in jobs:
+            by_region.setdefault(job["server"], []).append(job)
+
+        results = {}    # id(job) -> (status, data) or exception
+        for server, region_jobs in by_region.items():
+            semaphore = asyncio.Semaphore(AUTO_LIKE_PARALLELISM)
+
+            async def like(job):
+                async with semaphore:
+                    channel = self.get_channel(job["channel_id"])
+                    guild_id = channel.guild.id if channel and getattr(channel, "guild", None) else None
+                    try:
+                        results[id(job)] = await self.like_api.fetch(job["uid"], server, guild_id)
+                    except Exception as e:
+                        results[id(job)] = e
+
+            await asyncio.gather(*(like(job) for job in region_jobs))
+
+        failed = [job for job in jobs if isinstance(results[id(job)], (AdmissionRejected, CircuitOpenError))]
+
+        by_channel = {}
+        for job in jobs:
+            by_channel.setdefault(job["channel_id"], []).append(job)
+        for channel_id, channel_jobs in by_channel.items():
             try:
-                await asyncio.sleep(24 * 60 * 60)  # Wait 24 hours
-                await self.send_auto_like(uid, server, channel_id, user_id)
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                print(f"Error in auto-like loop for UID {uid}: {e}")
-                await asyncio.sleep(3600)  # Wait 1 hour before retrying
+                await self._send_auto_like_summary(channel_id, channel_jobs, results)
+            except Exception:
+                logger.exception("Error sending auto-like summary", extra={"channel_id": channel_id})
+        return failed
+
+    async def _send_auto_like_summary(self, channel_id, jobs, results):
+        channel = self.get_channel(channel_id)
+        if channel is None:
+            return
+        footer = "🔹 Auto-like executed • DEVOLOPED BY UNKNOWN X!TER"
+
+        if len(jobs) == 1:
+            job = jobs[0]
+            result = results[id(job)]
+            if not isinstance(result, Exception) and result[0] == 200:
+                embed = embeds.like_result(result[1], job["uid"], footer, auto=True)
+                self.dispatcher.background(channel, f"<@{job['user_id']}>", [embed], files=embeds.attachments)
+            return
+
+        lines = []
+        for job in jobs:
+            uid, server = job["uid"], self.format_server_with_flag(job["server"])
+            result = results[id(job)]
+            if isinstance(result, (AdmissionRejected, CircuitOpenError)):
+                lines.append(f"⚠️ `{uid}` ({server}) — will retry later")
+            elif isinstance(result, Exception):
+                lines.append(f"⚠️ `{uid}` ({server}) — request failed")
+            elif result[0] == 404:
+                lines.append(f"❌ `{uid}` ({server}) — player not found")
+            elif result[0] != 200:
+                lines.append(f"⚠️ `{uid}` ({server}) — API error")
+            elif result[1].get("status") == 1:
+                lines.append(f"✅ `{uid}` {result[1].get('player', 'Unknown')} ({server}) — +{result[1].get('likes_added', 0)} likes")
+            else:
+                lines.append(f"⏳ `{uid}` ({server}) — max likes reached today")
+
+        mentions = embeds.split_mentions(dict.fromkeys(job["user_id"] for job in jobs))
+        messages = embeds.split_messages(embeds.auto_like_summary(lines, footer))
+        for i in range(max(len(mentions), len(messages))):
+            self.dispatcher.background(channel, mentions[i] if i < len(mentions) else None,
+                                       messages[i] if i < len(messages) else None)
 
     @commands.hybrid_command(name="setlikechannel", description="Sets the channels where the /like command is allowed.")
     @commands.has_permissions(administrator=True)
     @app_commands.describe(channel="The channel to allow/disallow the /like command in.")
     async def set_like_channel(self, ctx: commands.Context, channel: discord.TextChannel):
         if ctx.guild is None:
-            await ctx.send("This command can only be used in a server.", ephemeral=True)
+            await self._respond(ctx, "This command can only be used in a server.", ephemeral=True)
             return
 
-        guild_id = str(ctx.guild.id)
-        server_config = self.config_data["servers"].setdefault(guild_id, {})
-        like_channels = server_config.setdefault("like_channels", [])
+        added = await self.guild_config.toggle(ctx.guild.id, channel.id)
 
-        channel_id_str = str(channel.id)
-
-        if channel_id_str in like_channels:
-            like_channels.remove(channel_id_str)
-            self.save_config()
-            await ctx.send(f"✅ Channel {channel.mention} has been **removed** from allowed channels for /like commands. The command is now **disallowed** there.", ephemeral=True)
+        if not added:
+            await self._respond(ctx, f"✅ Channel {channel.mention} has been **removed** from allowed channels for /like commands. The command is now **disallowed** there.", ephemeral=True)
         else:
-            like_channels.append(channel_id_str)
-            self.save_config()
-            await ctx.send(f"✅ Channel {channel.mention} is now **allowed** for /like commands. The command will **only** work in specified channels if any are set.", ephemeral=True)
+            await self._respond(ctx, f"✅ Channel {channel.mention} is now **allowed** for /like commands. The command will **only** work in specified channels if any are set.", ephemeral=True)
+
+    @commands.hybrid_command(name="reloadconfig", description="Reloads the channel configuration and bot settings from disk.")
+    @commands.has_permissions(administrator=True)
+    async def reload_config_command(self, ctx: commands.Context):
+        changed, errors = settings.reload()
+        channels_ok = self.guild_config.reload()
+
+        if errors or not channels_ok:
+            problems = errors + ([] if channels_ok else [f"`{CONFIG_FILE}` is invalid"])
+            await self._respond(ctx, "⚠️ Reload failed, the previous configuration is kept:\n" + "\n".join(f"- {p}" for p in problems), ephemeral=True)
+            return
+
+        await self._respond(ctx, f"✅ Configuration reloaded. Settings {'updated' if changed else 'unchanged'}.", ephemeral=True)
 
     @commands.hybrid_command(name="like", description="Sends likes to a Free Fire player")
     @app_commands.describe(uid="Player UID (numbers only, minimum 6 characters)", server="Server region (IND, BD, BR)")
@@ -175,109 +230,55 @@ class LikeCommands(commands.Cog):
         is_slash = ctx.interaction is not None
 
         if uid and server is None:
-            return await ctx.send("UID and server are required",delete_after=10)
+            return await self._respond(ctx, "UID and server are required",delete_after=10)
         if not await self.check_channel(ctx):
             msg = "This command is not available in this channel. Please use it in an authorized channel."
             if is_slash:
                 await ctx.response.send_message(msg, ephemeral=True)
             else:
-                await ctx.reply(msg, mention_author=False)
+                await self._reply(ctx, msg, mention_author=False)
             return
 
-        user_id = ctx.author.id
-        cooldown = 30
-        if user_id in self.cooldowns:
-            last_used = self.cooldowns[user_id]
-            remaining = cooldown - (datetime.now() - last_used).seconds
-            if remaining > 0:
-                await ctx.send(f"Please wait {remaining} seconds before using this command again.", ephemeral=is_slash)
-                return
-        self.cooldowns[user_id] = datetime.now()
+        guild_id = ctx.guild.id if ctx.guild else None
+        remaining = await self.cooldowns.hit("like", ctx.author.id, guild_id)
+        if remaining > 0:
+            metrics.COOLDOWN_REJECTIONS.inc(command="like")
+            await self._respond(ctx, f"Please wait {remaining} seconds before using this command again.", ephemeral=is_slash)
+            return
 
         if not uid.isdigit() or len(uid) < 6:
-            await ctx.reply("Invalid UID. It must contain only numbers and be at least 6 characters long.", mention_author=False, ephemeral=is_slash)
+            await self._reply(ctx, "Invalid UID. It must contain only numbers and be at least 6 characters long.", mention_author=False, ephemeral=is_slash)
             return
 
         # Validate server
         valid_servers = ["IND", "BD", "BR"]
         if server.upper() not in valid_servers:
-            await ctx.reply(f"Invalid server. Must be one of: {', '.join(valid_servers)}", mention_author=False, ephemeral=is_slash)
+            await self._reply(ctx, f"Invalid server. Must be one of: {', '.join(valid_servers)}", mention_author=False, ephemeral=is_slash)
             return
 
         try:
             async with ctx.typing():
-                url = f"{self.api_host}/like?uid={uid}&server={server}"
-                print(url)
-                async with self.session.get(url ) as response:
-                    if response.status == 404:
-                        await self._send_player_not_found(ctx, uid)
-                        return
-
-                    if response.status != 200:
-                        print(f"API Error: {response.status} - {await response.text()}")
-                        await self._send_api_error(ctx)
-                        return
-
-                    data = await response.json()
-                    embed = discord.Embed(
-                        title="FREE FIRE LIKE",
-                        color=0x2ECC71 if data.get("status") == 1 else 0xE74C3C,
-                        timestamp=datetime.now()
-                    )
-
-                    if data.get("status") == 1:
-                        # Create a more visually appealing embed
-                        embed.title = "🎉 LIKE SUCCESS"
-                        embed.description = (
-                            "✅ Likes delivered successfully!\n"
-                            "✨ Perfect execution!"
-                        )
-                        
-                        # Player Info Section
-                        embed.add_field(
-                            name="👤 Player Info",
-                            value=f"```\n[UID]     {uid}\n[Name]    {data.get('player', 'Unknown')}```",
-                            inline=True
-                        )
-                        
-                        # Server Region Section
-                        embed.add_field(
-                            name="🌐 Server Region",
-                            value=f"```\n{self.format_server_with_flag(data.get('region', 'Unknown'))} Server```",
-                            inline=True
-                        )
-                        
-                        # Like Stats Section
-                        likes_before = data.get('likes_before', 0)
-                        likes_after = data.get('likes_after', 0)
-                        likes_added = data.get('likes_added', 0)
-                        
-                        embed.add_field(
-                            name="📊 Like Stats",
-                            value=f"```\nBefore: {likes_before} likes\nAfter:  {likes_after} likes\nAdded:  {likes_added} likes```",
-                            inline=False
-                        )
-                        
-                        
-                        # Promotional Banner
-                        embed.add_field(
-                            name="",
-                            value="**INSTANT DELIVERY**",
-                            inline=False
-                        )
-                    else:
-                        embed.description = "This UID has already received the maximum likes today.\nPlease wait 24 hours and try again"
-
-                    embed.set_footer(text=f"🔹 Requested by {ctx.author.display_name} • DEVOLOPED BY UNKNOWN X!TER")
-                    embed.set_image(url="https://ibb.co.com/TM4kTbck")
-                    file = discord.File("assets/banned.gif", filename="banned.gif")
-                    embed.set_image(url="attachment://banned.gif")
-                    await ctx.send(embed=embed, mention_author=True, ephemeral=is_slash)
-
+                status, data = await self.like_api.fetch(uid, server, guild_id)
+                if status == 404:
+                    await self._send_player_not_found(ctx, uid)
+                    return
+
+                if status != 200:
+                    logger.warning("Like API error", extra={"status": status, "uid": uid, "server": server, "body": str(data)[:200]})
+                    await self._send_api_error(ctx)
+                    return
+
+                embed = embeds.like_result(data, uid, f"🔹 Requested by {ctx.author.display_name} • DEVOLOPED BY UNKNOWN X!TER")
+                await self._respond(ctx, embed=embed, mention_author=True, ephemeral=is_slash, **embeds.attachments())
+
+        except AdmissionRejected as e:
+            await self._send_busy_embed(ctx, e.retry_after)
+        except CircuitOpenError:
+            await self._send_api_error(ctx)
         except asyncio.TimeoutError:
             await self._send_error_embed(ctx, "Timeout", "The server took too long to respond.", ephemeral=is_slash)
-        except Exception as e:
-            print(f"Unexpected error in like_command: {e}")
+        except Exception:
+            logger.exception("Unexpected error in like_command")
             await self._send_error_embed(ctx, "Critical Error", "An unexpected error occurred. Please try again later.", ephemeral=is_slash)
 
     @commands.hybrid_command(name="auto_like", description="Automatically sends likes to a Free Fire player every 24 hours")
@@ -290,67 +291,61 @@ class LikeCommands(commands.Cog):
             if is_slash:
                 await ctx.response.send_message(msg, ephemeral=True)
             else:
-                await ctx.reply(msg, mention_author=False)
+                await self._reply(ctx, msg, mention_author=False)
             return
 
         # Validate UID
         if not uid.isdigit() or len(uid) < 6:
-            await ctx.reply("Invalid UID. It must contain only numbers and be at least 6 characters long.", mention_author=False, ephemeral=is_slash)
+            await self._reply(ctx, "Invalid UID. It must contain only numbers and be at least 6 characters long.", mention_author=False, ephemeral=is_slash)
             return
 
         # Validate server
         valid_servers = ["IND", "BD", "BR"]
         if server.upper() not in valid_servers:
-            await ctx.reply(f"Invalid server. Must be one of: {', '.join(valid_servers)}", mention_author=False, ephemeral=is_slash)
+            await self._reply(ctx, f"Invalid server. Must be one of: {', '.join(valid_servers)}", mention_author=False, ephemeral=is_slash)
             return
 
         server = server.upper()
-        task_key = f"{uid}_{server}_{ctx.channel.id}"
 
         # Check if auto-like is already running for this UID+server+channel
-        if task_key in self.auto_like_tasks:
-            await ctx.reply(f"❌ Auto-like is already running for UID `{uid}` in server `{server}` in this channel.", mention_author=False, ephemeral=is_slash)
+        if AutoLikeScheduler.make_key(uid, server, ctx.channel.id) in self.auto_like_scheduler.jobs:
+            await self._reply(ctx, f"❌ Auto-like is already running for UID `{uid}` in server `{server}` in this channel.", mention_author=False, ephemeral=is_slash)
             return
 
         try:
             async with ctx.typing():
                 # Test the API first
-                url = f"{self.api_host}/like?uid={uid}&server={server}"
-                async with self.session.get(url) as response:
-                    if response.status == 404:
-                        await self._send_player_not_found(ctx, uid)
-                        return
-                    if response.status != 200:
-                        await self._send_api_error(ctx)
-                        return
-
-                # Start the auto-like task
-                task = asyncio.create_task(self.auto_like_loop(uid, server, ctx.channel.id, ctx.author.id))
-                self.auto_like_tasks[task_key] = task
+                status, _ = await self.like_api.fetch(uid, server, ctx.guild.id if ctx.guild else None)
+                if status == 404:
+                    await self._send_player_not_found(ctx, uid)
+                    return
+                if status != 200:
+                    await self._send_api_error(ctx)
+                    return
+
+                # Schedule the auto-like job (it may have been added while the API was checked)
+                if not await self.auto_like_scheduler.add(uid, server, ctx.channel.id, ctx.author.id):
+                    await self._reply(ctx, f"❌ Auto-like is already running for UID `{uid}` in server `{server}` in this channel.", mention_author=False, ephemeral=is_slash)
+                    return
 
                 # Send confirmation embed
-                embed = discord.Embed(
-                    title="🔄 AUTO LIKE ADDED SUCCESFULLY",
-                    color=0x2ECC71,
-                    timestamp=datetime.now()
-                )
-                embed.description = (
+                embed = embeds.render("auto_added", "**DEVOLOPED BY UNKNOWN X!TER**", description=(
                     f"**UID:** {uid}\n"
                     f"**Server:** {self.format_server_with_flag(server)}\n"
                     f"**Channel:** {ctx.channel.mention}\n"
                     f"**Started by:** {ctx.author.mention}\n\n"
                     f"✅ Auto-like is now active!\n"
                     f"🕐 Next like will be sent in 24 hours\n"
-                    f"🔄 This will continue until the bot is restarted"
-                )
-                embed.set_footer(text="**DEVOLOPED BY UNKNOWN X!TER**")
-                embed.set_image(url="https://ibb.co.com/TM4kTbck")
-                file = discord.File("assets/banned.gif", filename="banned.gif")
-                embed.set_image(url="attachment://banned.gif
-                await ctx.send(embed=embed, mention_author=True, ephemeral=is_slash)
-
-        except Exception as e:
-            print(f"Error starting auto-like: {e}")
+                    f"🔄 This will continue until stopped, even across bot restarts"
+                ))
+                await self._respond(ctx, embed=embed, mention_author=True, ephemeral=is_slash, **embeds.attachments())
+
+        except AdmissionRejected as e:
+            await self._send_busy_embed(ctx, e.retry_after)
+        except CircuitOpenError:
+            await self._send_api_error(ctx)
+        except Exception:
+            logger.exception("Error starting auto-like")
             await self._send_error_embed(ctx, "Error", "Failed to start auto-like. Please try again later.", ephemeral=is_slash)
 
     @commands.hybrid_command(name="stop_auto_like", description="Stops auto-like for a specific UID and server")
@@ -359,17 +354,12 @@ class LikeCommands(commands.Cog):
         is_slash = ctx.interaction is not None
         
         server = server.upper()
-        task_key = f"{uid}_{server}_{ctx.channel.id}"
-
-        if task_key not in self.auto_like_tasks:
-            await ctx.reply(f"❌ No auto-like found for UID `{uid}` in server `{server}` in this channel.", mention_author=False, ephemeral=is_slash)
-            return
 
         try:
-            # Cancel the task
-            task = self.auto_like_tasks[task_key]
-            task.cancel()
-            del self.auto_like_tasks[task_key]
+            # Remove the scheduled job (the shared backend knows about jobs added by other workers)
+            if not await self.auto_like_scheduler.remove(uid, server, ctx.channel.id):
+                await self._reply(ctx, f"❌ No auto-like found for UID `{uid}` in server `{server}` in this channel.", mention_author=False, ephemeral=is_slash)
+                return
 
             embed = discord.Embed(
                 title="🛑 AUTO LIKE STOPPED",
@@ -385,18 +375,18 @@ class LikeCommands(commands.Cog):
             )
             embed.set_footer(text="**DEVOLOPED BY UNKNOWN X!TER**")
             
-            await ctx.send(embed=embed, mention_author=True, ephemeral=is_slash)
+            await self._respond(ctx, embed=embed, mention_author=True, ephemeral=is_slash)
 
-        except Exception as e:
-            print(f"Error stopping auto-like: {e}")
+        except Exception:
+            logger.exception("Error stopping auto-like")
             await self._send_error_embed(ctx, "Error", "Failed to stop auto-like.", ephemeral=is_slash)
 
     @commands.hybrid_command(name="list_auto_likes", description="Shows all active auto-like tasks")
     async def list_auto_likes_command(self, ctx: commands.Context):
         is_slash = ctx.interaction is not None
-        
-        if not self.auto_like_tasks:
-            await ctx.reply("❌ No active auto-like tasks found.", mention_author=False, ephemeral=is_slash)
+
+        if not self.auto_like_scheduler.jobs:
+            await self._reply(ctx, "❌ No active auto-like tasks found.", mention_author=False, ephemeral=is_slash)
             return
 
         embed = discord.Embed(
@@ -406,51 +396,78 @@ class LikeCommands(commands.Cog):
         )
         
         task_list = []
-        for task_key in self.auto_like_tasks.keys():
-            uid, server, channel_id = task_key.rsplit('_', 2)
-            channel = self.bot.get_channel(int(channel_id))
+        for job in self.auto_like_scheduler.jobs.values():
+            uid, server = job["uid"], job["server"]
+            channel = self.bot.get_channel(job["channel_id"])
             channel_name = channel.name if channel else "Unknown Channel"
             task_list.append(f"**UID:** `{uid}` | **Server:** {self.format_server_with_flag(server)} | **Channel:** #{channel_name}")
 
         embed.description = "\n".join(task_list) if task_list else "No active tasks"
         embed.set_footer(text="**DEVOLOPED BY UNKNOWN X!TER**")
-        await ctx.send(embed=embed, mention_author=True, ephemeral=is_slash)
+        await self._respond(ctx, embed=embed, mention_author=True, ephemeral=is_slash)
+
+    async def _respond(self, ctx, *args, **kwargs):
+        """ctx.send through the dispatcher, ahead of queued background posts"""
+        return await self.dispatcher.interactive(self._reply_channel(ctx), ctx.send, *args, **kwargs)
+
+    async def _reply(self, ctx, *args, **kwargs):
+        """ctx.reply through the dispatcher, ahead of queued background posts"""
+        return await self.dispatcher.interactive(self._reply_channel(ctx), ctx.reply, *args, **kwargs)
+
+    @staticmethod
+    def _reply_channel(ctx):
+        # Interaction responses go through the interaction webhook, not the channel's rate limit
+        return None if ctx.interaction else ctx.channel.id
 
     async def _send_player_not_found(self, ctx, uid):
         embed = discord.Embed(title="Player Not Found", description=f"The UID {uid} does not exist or is not accessible.", color=0xE74C3C)
         embed.add_field(name="Tip", value="Make sure that:\n- The UID is correct\n- The player is not private", inline=False)
         try:
             if ctx.interaction and not ctx.interaction.response.is_done():
-                await ctx.send(embed=embed, ephemeral=True)
+                await self._respond(ctx, embed=embed, ephemeral=True)
             elif not ctx.interaction:
-                await ctx.send(embed=embed)
+                await self._respond(ctx, embed=embed)
         except Exception as e:
-            print(f"Failed to send player not found embed: {e}")
+            logger.warning("Failed to send player not found embed: %s", e)
         
     async def _send_api_error(self, ctx):
         embed = discord.Embed(title="⚠️ Service Unavailable", description="The Free Fire API is not responding at the moment.", color=0xF39C12)
         embed.add_field(name="Solution", value="Try again in a few minutes.", inline=False)
         try:
             if ctx.interaction and not ctx.interaction.response.is_done():
-                await ctx.send(embed=embed, ephemeral=True)
+                await self._respond(ctx, embed=embed, ephemeral=True)
+            elif not ctx.interaction:
+                await self._respond(ctx, embed=embed)
+        except Exception as e:
+            logger.warning("Failed to send API error embed: %s", e)
+
+    async def _send_busy_embed(self, ctx, retry_after):
+        embed = discord.Embed(title="⏳ Bot Busy", description="Too many like requests are being processed right now.", color=0xF39C12)
+        embed.add_field(name="Solution", value=f"Retry in {retry_after} seconds.", inline=False)
+        try:
+            if ctx.interaction and not ctx.interaction.response.is_done():
+                await self._respond(ctx, embed=embed, ephemeral=True)
             elif not ctx.interaction:
-                await ctx.send(embed=embed)
+                await self._respond(ctx, embed=embed)
         except Exception as e:
-            print(f"Failed to send API error embed: {e}")
+            logger.warning("Failed to send busy embed: %s", e)
 
     async def _send_error_embed(self, ctx, title, description, ephemeral=True):
         embed = discord.Embed(title=f"❌ {title}", description=description, color=discord.Color.red(), timestamp=datetime.now())
         embed.set_footer(text="An error occurred.")
         try:
             if ctx.interaction and not ctx.interaction.response.is_done():
-                await ctx.send(embed=embed, ephemeral=ephemeral)
+                await self._respond(ctx, embed=embed, ephemeral=ephemeral)
             elif not ctx.interaction:
-                await ctx.send(embed=embed)
+                await self._respond(ctx, embed=embed)
         except Exception as e:
-            print(f"Failed to send error embed: {e}")
+            logger.warning("Failed to send error embed: %s", e)
 
     def cog_unload(self):
-        self.bot.loop.create_task(self.session.close())
+        self.auto_like_scheduler.close()
+        self.dispatcher.stop()
+        settings.remove_listener(self.apply_settings)
+        self.guild_config.close()
 
 async def setup(bot):
     await bot.add_cog(LikeCommands(bot))
@@ -0,0 +1,133 @@
+# config_loader.py
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024      # Bytes read at a time when streaming a config file
+
+_decoder = json.JSONDecoder()
+
+
+def iter_records(path: str, chunk_size: int = CHUNK_SIZE):
+    """
+    Stream the elements of a top-level JSON array one by one, without loading the whole file.
+    Yields (index, record). Raises ValueError if the file is not a JSON array.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        pos = 0
+        eof = False
+        started = False
+        expect_value = True     # After "[" or ",": an element comes next, otherwise "," or "]"
+        index = 0
+
+        def fill():
+            nonlocal buffer, pos, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+        def skip_whitespace(start: int) -> int:
+            while start < len(buffer) and buffer[start].isspace():
+                start += 1
+            return start
+
+        while True:
+            pos = skip_whitespace(pos)
+            if pos >= len(buffer):
+                if eof:
+                    raise ValueError(f"{path}: unexpected end of file")
+                fill()
+                continue
+
+            char = buffer[pos]
+            if not started:
+                if char != "[":
+                    raise ValueError(f"{path}: expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if not expect_value:
+                if char == "]":
+                    return
+                if char != ",":
+                    raise ValueError(f"{path}: expected ',' or ']' after element {index - 1}")
+                expect_value = True
+                pos += 1
+                continue
+            if char == "]" and index == 0:
+                return
+            if char in ",]":
+                raise ValueError(f"{path}: missing element {index}")
+
+            try:
+                record, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()  # The record spans past the end of the buffer
+                continue
+            # Only trust the element once its delimiter is in the buffer: a number cut at
+            # the buffer boundary ("1.5" of "1.5e3") decodes fine but is incomplete
+            after = skip_whitespace(end)
+            if not eof and (after == len(buffer) or buffer[after] not in ",]"):
+                fill()
+                continue
+            yield index, record
+            index += 1
+            pos = end
+            expect_value = False
+
+
+def validate_account(record) -> str | None:
+    """Return why an account record is invalid, or None if it is fine."""
+    if not isinstance(record, dict):
+        return "not an object"
+    uid = record.get("uid")
+    if uid is None or not str(uid).isdigit():
+        return "missing or non-numeric uid"
+    password = record.get("password")
+    if not isinstance(password, str) or not password:
+        return "missing password"
+    return None
+
+
+class AccountLoader:
+    """
+    Loads configs/config_{zone}.json account lists.
+    Files are streamed, validated once per version (mtime and size) and cached until they change.
+    """
+
+    def __init__(self, report=logger.warning):
+        self.report = report
+        self._cache = {}    # (path, limit) -> (mtime_ns, size, accounts)
+
+    def load(self, path: str, limit: int | None = None) -> list:
+        """Valid account records of `path`, stopping after `limit` of them."""
+        stat = os.stat(path)
+        key = (path, limit)
+        cached = self._cache.get(key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
+        accounts = []
+        invalid = []
+        for index, record in iter_records(path):
+            error = validate_account(record)
+            if error:
+                invalid.append(f"#{index}: {error}")
+                continue
+            accounts.append(record)
+            if limit is not None and len(accounts) >= limit:
+                break
+
+        if invalid:
+            shown = ", ".join(invalid[:10]) + (f" (+{len(invalid) - 10} more)" if len(invalid) > 10 else "")
+            self.report(f"⚠️ `{path}`: {len(invalid)} invalid account records skipped: {shown}")
+
+        self._cache[key] = (stat.st_mtime_ns, stat.st_size, accounts)
+        return accounts
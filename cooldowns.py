@@ -0,0 +1,55 @@
+# cooldowns.py
+import math
+import time
+
+SWEEP_INTERVAL = 60     # Seconds between two sweeps of expired entries
+
+
+class CooldownTracker:
+    """
+    Per-command user cooldowns on a monotonic clock.
+    Entries expire on their own, so memory stays proportional to users currently on cooldown.
+    With a shared state backend (a state_backend.AsyncBackend), cooldowns are enforced across every worker process.
+    """
+
+    def __init__(self, default: float = 30, command_limits: dict | None = None, guild_limits: dict | None = None,
+                 backend=None):
+        self.default = default
+        self.command_limits = command_limits or {}    # command -> seconds
+        self.guild_limits = guild_limits or {}        # (guild_id, command) -> seconds, overrides command_limits
+        self._expiry = {}                             # (command, user_id) -> monotonic expiry time
+        self._next_sweep = time.monotonic() + SWEEP_INTERVAL
+        self.backend = backend
+
+    def limit_for(self, command: str, guild_id: int | None = None) -> float:
+        if guild_id is not None and (guild_id, command) in self.guild_limits:
+            return self.guild_limits[(guild_id, command)]
+        return self.command_limits.get(command, self.default)
+
+    async def hit(self, command: str, user_id: int, guild_id: int | None = None) -> int:
+        """
+        Register a use of `command` by `user_id`.
+        Returns 0 if allowed, otherwise the whole seconds left before the user may retry.
+        """
+        if self.backend is not None:
+            remaining = await self.backend.try_reserve("cooldowns", f"{command}:{user_id}", self.limit_for(command, guild_id))
+            return math.ceil(remaining)
+
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+        key = (command, user_id)
+        expiry = self._expiry.get(key)
+        if expiry is not None and expiry > now:
+            return math.ceil(expiry - now)
+
+        self._expiry[key] = now + self.limit_for(command, guild_id)
+        return 0
+
+    def __len__(self):
+        return len(self._expiry)
+
+    def _sweep(self, now: float):
+        self._expiry = {key: expiry for key, expiry in self._expiry.items() if expiry > now}
+        self._next_sweep = now + SWEEP_INTERVAL
@@ -0,0 +1,236 @@
+# dispatcher.py
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 0     # Replies to a user's command: always served first
+BACKGROUND = 1      # Auto-like results and other unsolicited posts
+
+CHANNEL_RATE = 1            # Messages per second per channel (sustained)
+CHANNEL_BURST = 5           # Messages a channel may send back to back
+GLOBAL_RATE = 40            # Messages per second for the whole bot
+GLOBAL_BURST = 40
+MAX_BACKGROUND_AGE = 300    # Background messages older than this are dropped
+MAX_BACKGROUND_QUEUE = 500  # Background messages kept waiting before new ones are dropped
+MAX_EMBEDS = 10             # Discord limit per message, also the merge limit
+MAX_CONTENT = 2000
+MAX_EMBED_CHARS = 6000      # Discord limit on the total text of a message's embeds
+PRUNE_INTERVAL = 60         # Seconds between two sweeps of idle channel buckets
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available (0 if one is available now)."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float):
+        self._refill(now)
+        self.tokens -= 1
+
+
+class _Message:
+    def __init__(self, priority: int, channel_id, send, future=None, content=None, embeds=None):
+        self.priority = priority
+        self.channel_id = channel_id
+        self.send = send            # Interactive: coroutine function. Background: channel.send
+        self.future = future
+        self.content = content
+        self.embeds = list(embeds or [])
+        self.files = None           # Background only: callable returning send() kwargs for attachments
+        self.enqueued_at = time.monotonic()
+
+
+class MessageDispatcher:
+    """
+    Outbound Discord message queue with per-channel and global token buckets.
+    Interactive replies jump ahead of background posts. Background posts for the same channel
+    are merged while they wait, and dropped once they are older than MAX_BACKGROUND_AGE.
+    """
+
+    def __init__(self):
+        self.channel_buckets = {}
+        self.global_bucket = TokenBucket(GLOBAL_RATE, GLOBAL_BURST)
+        self.dropped = 0
+        self.merged = 0
+        self._heap = []             # (priority, seq, message)
+        self._seq = itertools.count()
+        self._pending_background = {}   # channel_id -> queued background message, for merging
+        self._background_count = 0
+        self._wakeup = asyncio.Event()
+        self._worker = None
+        self._deliveries = set()    # Running _deliver tasks, referenced until they finish
+        self._next_prune = time.monotonic() + PRUNE_INTERVAL
+
+    def start(self):
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+
+    def stop(self):
+        """Stop the worker. Queued replies are sent right away, queued background posts are dropped."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        for _, _, message in self._heap:
+            if message.priority == INTERACTIVE:
+                self._start_delivery(message)  # Its caller is waiting on the result
+            else:
+                self.dropped += 1
+        self._heap.clear()
+        self._pending_background.clear()
+        self._background_count = 0
+
+    async def interactive(self, channel_id, send, *args, **kwargs):
+        """
+        Queue send(*args, **kwargs) ahead of background traffic and wait for its result.
+        channel_id None sends right away: interaction responses are not channel messages
+        and do not count against the bot's message rate limits.
+        """
+        if self._worker is None or channel_id is None:
+            return await send(*args, **kwargs)
+        future = asyncio.get_running_loop().create_future()
+        message = _Message(INTERACTIVE, channel_id, lambda: send(*args, **kwargs), future)
+        self._push(message)
+        return await future
+
+    def background(self, channel, content=None, embeds=None, files=None):
+        """
+        Queue a post without waiting for it. Merged into the channel's pending background
+        message when possible. `files` is a callable returning send() kwargs, evaluated at send time.
+        """
+        pending = self._pending_background.get(channel.id)
+        if pending is not None and files is None and pending.files is None and self._can_merge(pending, content, embeds):
+            if content:
+                pending.content = f"{pending.content}\n{content}" if pending.content else content
+            pending.embeds.extend(embeds or [])
+            self.merged += 1
+            return
+        if self._background_count >= MAX_BACKGROUND_QUEUE:
+            self.dropped += 1
+            return
+
+        message = _Message(BACKGROUND, channel.id, channel.send, content=content, embeds=embeds)
+        message.files = files
+        self._pending_background[channel.id] = message
+        self._background_count += 1
+        self._push(message)
+
+    def stats(self) -> dict:
+        return {"queued": len(self._heap), "background": self._background_count,
+                "dropped": self.dropped, "merged": self.merged}
+
+    @staticmethod
+    def _can_merge(pending: _Message, content, embeds) -> bool:
+        if len(pending.embeds) + len(embeds or []) > MAX_EMBEDS:
+            return False
+        if sum(len(embed) for embed in pending.embeds + list(embeds or [])) > MAX_EMBED_CHARS:
+            return False
+        return len(pending.content or "") + len(content or "") + 1 <= MAX_CONTENT
+
+    def _push(self, message: _Message):
+        heapq.heappush(self._heap, (message.priority, next(self._seq), message))
+        self._wakeup.set()
+
+    def _bucket(self, channel_id) -> TokenBucket:
+        bucket = self.channel_buckets.get(channel_id)
+        if bucket is None:
+            bucket = self.channel_buckets[channel_id] = TokenBucket(CHANNEL_RATE, CHANNEL_BURST)
+        return bucket
+
+    def _next_ready(self, now: float):
+        """Pop the highest-priority message whose channel can send now. Returns (message, wait)."""
+        deferred = []
+        chosen = None
+        wait = None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            message = entry[2]
+            if message.priority == BACKGROUND and now - message.enqueued_at > MAX_BACKGROUND_AGE:
+                self._forget_background(message)
+                self.dropped += 1
+                continue
+            channel_wait = self._bucket(message.channel_id).wait_time(now)
+            if channel_wait == 0:
+                chosen = message
+                break
+            deferred.append(entry)
+            wait = channel_wait if wait is None else min(wait, channel_wait)
+        for entry in deferred:
+            heapq.heappush(self._heap, entry)
+        return chosen, wait
+
+    def _prune(self, now: float):
+        """Drop buckets that refilled completely: a new bucket would be identical."""
+        for channel_id, bucket in list(self.channel_buckets.items()):
+            if bucket.wait_time(now) == 0 and bucket.tokens >= bucket.capacity:
+                del self.channel_buckets[channel_id]
+        self._next_prune = now + PRUNE_INTERVAL
+
+    def _forget_background(self, message: _Message):
+        self._background_count -= 1
+        if self._pending_background.get(message.channel_id) is message:
+            del self._pending_background[message.channel_id]
+
+    async def _run(self):
+        while True:
+            now = time.monotonic()
+            if now >= self._next_prune:
+                self._prune(now)
+            global_wait = self.global_bucket.wait_time(now)
+            if global_wait:
+                await asyncio.sleep(global_wait)
+                continue
+
+            message, wait = self._next_ready(now)
+            if message is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self.global_bucket.take(now)
+            self._bucket(message.channel_id).take(now)
+            if message.priority == BACKGROUND:
+                self._forget_background(message)  # No more merging once it is being sent
+            self._start_delivery(message)
+
+    def _start_delivery(self, message: _Message):
+        task = asyncio.create_task(self._deliver(message))
+        self._deliveries.add(task)
+        task.add_done_callback(self._deliveries.discard)
+
+    async def _deliver(self, message: _Message):
+        try:
+            if message.priority == INTERACTIVE:
+                result = await message.send()
+            else:
+                kwargs = message.files() if message.files else {}
+                if len(message.embeds) == 1:
+                    kwargs["embed"] = message.embeds[0]
+                elif message.embeds:
+                    kwargs["embeds"] = message.embeds
+                result = await message.send(message.content, **kwargs)
+        except Exception as e:
+            if message.future is not None and not message.future.done():
+                message.future.set_exception(e)
+            else:
+                logger.warning("Failed to deliver message", extra={"channel_id": message.channel_id, "error": str(e)})
+            return
+        if message.future is not None and not message.future.done():
+            message.future.set_result(result)
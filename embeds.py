@@ -0,0 +1,144 @@
+# embeds.py
+import io
+import os
+from datetime import datetime, timezone
+
+import discord
+
+BANNER_PATH = "assets/banned.gif"
+BANNER_FILENAME = "banned.gif"
+
+SUMMARY_LINES_PER_EMBED = 30
+MAX_EMBEDS_PER_MESSAGE = 10     # Discord limits per message
+MAX_EMBED_CHARS = 6000          # Total of titles, descriptions, fields and footers
+MAX_CONTENT_CHARS = 2000
+
+SUCCESS_COLOR = 0x2ECC71
+FAILURE_COLOR = 0xE74C3C
+
+FLAGS = {
+    "IND": "🇮🇳",  # India
+    "BD": "🇧🇩",   # Bangladesh
+    "BR": "🇧🇷"    # Brazil
+}
+
+_banner_bytes = None
+
+
+def format_server_with_flag(server: str) -> str:
+    """Format server name with flag"""
+    return f"{server} {FLAGS.get(server.upper(), '🌍')}"
+
+
+def _template(title: str, color: int, description: str, fields=(), banner: bool = True) -> dict:
+    embed = discord.Embed(title=title, color=color, description=description)
+    for name, inline in fields:
+        embed.add_field(name=name, value="", inline=inline)
+    if banner:
+        embed.set_image(url=f"attachment://{BANNER_FILENAME}")
+    return embed.to_dict()
+
+
+_SUCCESS_FIELDS = (("👤 Player Info", True), ("🌐 Server Region", True), ("📊 Like Stats", False), ("", False))
+
+TEMPLATES = {
+    "like_success": _template("🎉 LIKE SUCCESS", SUCCESS_COLOR,
+                              "✅ Likes delivered successfully!\n✨ Perfect execution!", _SUCCESS_FIELDS),
+    "like_max": _template("FREE FIRE LIKE", FAILURE_COLOR,
+                          "This UID has already received the maximum likes today.\nPlease wait 24 hours and try again"),
+    "auto_success": _template("🔄 AUTO LIKE SUCCESFULLY SENDED", SUCCESS_COLOR,
+                              "✅ Auto-like delivered successfully!\n✨ Perfect execution!", _SUCCESS_FIELDS),
+    "auto_max": _template("🔄 AUTO LIKE SUCCESFULLY SENDED", FAILURE_COLOR,
+                          "This UID has already received the maximum likes today.\nAuto-like will try again in 24 hours."),
+    "auto_added": _template("🔄 AUTO LIKE ADDED SUCCESFULLY", SUCCESS_COLOR, ""),
+    "auto_summary": _template("🔄 AUTO LIKE SUMMARY", 0x3498DB, "", banner=False),
+}
+
+
+def render(kind: str, footer: str, description: str | None = None, field_values=()) -> discord.Embed:
+    """Build an embed from a prebuilt template, filling only the per-request parts."""
+    data = dict(TEMPLATES[kind])
+    if "fields" in data:
+        data["fields"] = [dict(field) for field in data["fields"]]
+        for field, value in zip(data["fields"], field_values):
+            field["value"] = value
+    if description is not None:
+        data["description"] = description
+    data["footer"] = {"text": footer}
+    data["timestamp"] = datetime.now(timezone.utc).isoformat()
+    if _load_banner() is None:
+        data.pop("image", None)
+    return discord.Embed.from_dict(data)
+
+
+def like_result(data: dict, uid: str, footer: str, auto: bool = False) -> discord.Embed:
+    """Embed for a /like API result (status 1 = likes sent, anything else = daily maximum reached)."""
+    prefix = "auto" if auto else "like"
+    if data.get("status") != 1:
+        return render(f"{prefix}_max", footer)
+    return render(f"{prefix}_success", footer, field_values=(
+        f"```\n[UID]     {uid}\n[Name]    {data.get('player', 'Unknown')}```",
+        f"```\n{format_server_with_flag(data.get('region', 'Unknown'))} Server```",
+        f"```\nBefore: {data.get('likes_before', 0)} likes\nAfter:  {data.get('likes_after', 0)} likes\nAdded:  {data.get('likes_added', 0)} likes```",
+        "**INSTANT DELIVERY**",
+    ))
+
+
+def auto_like_summary(lines: list[str], footer: str) -> list[discord.Embed]:
+    """Summary embeds for a batch of auto-like results in one channel, see split_messages to send them."""
+    chunks = [lines[i:i + SUMMARY_LINES_PER_EMBED] for i in range(0, len(lines), SUMMARY_LINES_PER_EMBED)]
+    return [
+        render("auto_summary", footer, description="\n".join(chunk))
+        for chunk in chunks
+    ]
+
+
+def split_messages(items: list[discord.Embed]) -> list[list[discord.Embed]]:
+    """Group embeds into messages that stay within Discord's count and total length limits."""
+    messages, current, size = [], [], 0
+    for embed in items:
+        if current and (len(current) == MAX_EMBEDS_PER_MESSAGE or size + len(embed) > MAX_EMBED_CHARS):
+            messages.append(current)
+            current, size = [], 0
+        current.append(embed)
+        size += len(embed)
+    if current:
+        messages.append(current)
+    return messages
+
+
+def split_mentions(user_ids) -> list[str]:
+    """Mention strings for the given users, each short enough to be a message's content."""
+    chunks, current = [], ""
+    for user_id in user_ids:
+        mention = f"<@{user_id}>"
+        if current and len(current) + 1 + len(mention) > MAX_CONTENT_CHARS:
+            chunks.append(current)
+            current = ""
+        current = f"{current} {mention}" if current else mention
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _load_banner() -> bytes | None:
+    """Read the banner once and keep it in memory."""
+    global _banner_bytes
+    if _banner_bytes is None and os.path.exists(BANNER_PATH):
+        with open(BANNER_PATH, "rb") as f:
+            _banner_bytes = f.read()
+    return _banner_bytes
+
+
+def banner_file() -> discord.File | None:
+    """A fresh discord.File over the in-memory banner (a File can only be sent once)."""
+    banner = _load_banner()
+    if banner is None:
+        return None
+    return discord.File(io.BytesIO(banner), filename=BANNER_FILENAME)
+
+
+def attachments() -> dict:
+    """Keyword arguments that attach the banner to a send() call, if the asset exists."""
+    file = banner_file()
+    return {"file": file} if file else {}
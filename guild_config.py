@@ -0,0 +1,214 @@
+# guild_config.py
+import asyncio
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+CONFIG_FILE = "like_channels.json"
+LOG_FILE = "like_channels.log"
+COMPACT_EVERY = 500     # Log entries before the snapshot is rewritten and the log truncated
+SYNC_INTERVAL = 30      # Shared backend: seconds between two reloads of changes made by other workers
+
+
+class GuildConfigStore:
+    """
+    Allowed /like channels per guild, held as sets for O(1) membership checks.
+    Changes are appended to LOG_FILE (one JSON line each) and folded into the
+    CONFIG_FILE snapshot every COMPACT_EVERY entries. File I/O runs on a single
+    background thread so writes stay ordered and off the event loop.
+
+    With a shared state backend (a state_backend.AsyncBackend), each allowed channel is a
+    "guild:channel" key there instead, so toggles are atomic per channel and every worker
+    process sees them within SYNC_INTERVAL. Call start() to load them.
+    """
+
+    def __init__(self, path: str = CONFIG_FILE, log_path: str = LOG_FILE, backend=None):
+        self.path = path
+        self.log_path = log_path
+        self.backend = backend
+        self.channels = {}      # guild_id (str) -> set of channel ids (str)
+        self._log_entries = 0
+        self._snapshot_stat = None  # (mtime, size) of CONFIG_FILE as last read or written by this store
+        self._changes = 0       # Local toggles, so a reload started before one does not undo it
+        self._sync_task = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="guild-config")
+        if backend is None:
+            self.load()
+
+    async def start(self):
+        """Shared backend only: load the channels and keep reloading them in the background."""
+        if self.backend is None or self._sync_task is not None:
+            return
+        await self._import_files()
+        await self.refresh()
+        self._sync_task = asyncio.create_task(self._sync())
+
+    async def _import_files(self):
+        """Copy CONFIG_FILE and LOG_FILE into an empty shared backend, once, so switching to STATE_BACKEND keeps them."""
+        if not (os.path.exists(self.path) or os.path.exists(self.log_path)):
+            return
+        if not await self.backend.claim_once(f"import:{self.path}") or await self.backend.items("like_channels"):
+            return
+        try:
+            channels, _ = self._read()
+        except ValueError as e:
+            logger.warning("⚠️ Invalid %s, nothing to import: %s", self.path, e)
+            return
+        for guild_id, guild_channels in channels.items():
+            for channel_id in guild_channels:
+                await self.backend.set("like_channels", f"{guild_id}:{channel_id}", 1)
+        logger.warning("Imported the like channels of %d guilds from %s into the shared backend; the file is no longer used",
+                       len(channels), self.path)
+
+    async def refresh(self):
+        """Shared backend only: pick up channels toggled by other workers."""
+        changes = self._changes
+        stored = await self.backend.items("like_channels")
+        if changes != self._changes:
+            return  # A local toggle raced with the read, the next sync has it
+        channels = {}
+        for key in stored:
+            guild_id, _, channel_id = key.partition(":")
+            channels.setdefault(guild_id, set()).add(channel_id)
+        self.channels = channels
+
+    async def _sync(self):
+        while True:
+            await asyncio.sleep(SYNC_INTERVAL)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning("Failed to reload like channels", extra={"error": str(e)})
+
+    def load(self):
+        """Read the snapshot and replay the change log on top of it."""
+        self._snapshot_stat = self._stat()
+        try:
+            self.channels, self._log_entries = self._read()
+        except ValueError:
+            logger.warning("Configuration file %s is corrupt or empty, resetting to default configuration", self.path)
+            self.channels, self._log_entries = self._read(skip_snapshot=True)
+
+    def reload(self) -> bool:
+        """
+        Re-read the files after an external edit. The current config is kept if the snapshot is invalid.
+        A hand-edited snapshot is authoritative: changes logged before the edit are discarded.
+        """
+        if self.backend is not None:
+            return True  # No files: the background sync keeps the channels current
+        stat = self._stat()
+        edited = stat != self._snapshot_stat
+        try:
+            channels, entries = self._read(skip_log=edited)
+        except ValueError as e:
+            logger.warning("⚠️ Invalid %s, keeping the current configuration: %s", self.path, e)
+            return False
+        if edited:
+            # Queued behind pending appends, so every entry logged so far is dropped
+            self._executor.submit(self._truncate_log)
+            self._snapshot_stat = stat
+        self.channels, self._log_entries = channels, entries
+        return True
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read(self, skip_snapshot: bool = False, skip_log: bool = False) -> tuple[dict, int]:
+        """Build a fresh channel map without touching the live one. Raises ValueError on an invalid snapshot."""
+        channels = {}
+        if os.path.exists(self.path) and not skip_snapshot:
+            with open(self.path, 'r') as f:
+                servers = json.load(f).get("servers", {})
+            for guild_id, server_config in servers.items():
+                guild_channels = set(server_config.get("like_channels", []))
+                if guild_channels:
+                    channels[guild_id] = guild_channels
+
+        entries = 0
+        if os.path.exists(self.log_path) and not skip_log:
+            with open(self.log_path, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Torn last line after a crash
+                    self._apply(entry["op"], entry["guild"], entry["channel"], channels)
+                    entries += 1
+        return channels, entries
+
+    def is_allowed(self, guild_id, channel_id) -> bool:
+        """A channel is allowed if the guild has no restriction or lists it."""
+        channels = self.channels.get(str(guild_id))
+        return not channels or str(channel_id) in channels
+
+    async def toggle(self, guild_id, channel_id) -> bool:
+        """Allow the channel if it is not allowed yet, otherwise remove it. Returns True if it was added."""
+        guild_id, channel_id = str(guild_id), str(channel_id)
+        if self.backend is not None:
+            # Decide from the backend, not the local copy, which may miss other workers' toggles
+            key = f"{guild_id}:{channel_id}"
+            added = await self.backend.get("like_channels", key) is None
+            if added:
+                await self.backend.set("like_channels", key, 1)
+            else:
+                await self.backend.delete("like_channels", key)
+            self._changes += 1
+            self._apply("add" if added else "remove", guild_id, channel_id)
+            return added
+
+        op = "remove" if channel_id in self.channels.get(guild_id, set()) else "add"
+        self._apply(op, guild_id, channel_id)
+        loop = asyncio.get_running_loop()
+        line = json.dumps({"op": op, "guild": guild_id, "channel": channel_id}) + "\n"
+        await loop.run_in_executor(self._executor, self._append, line)
+        self._log_entries += 1
+        if self._log_entries >= COMPACT_EVERY:
+            snapshot = self._snapshot()
+            self._log_entries = 0
+            await loop.run_in_executor(self._executor, self._compact, snapshot)
+        return op == "add"
+
+    def close(self):
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            self._sync_task = None
+        self._executor.shutdown(wait=True)
+
+    def _apply(self, op: str, guild_id: str, channel_id: str, channels: dict | None = None):
+        channels = self.channels if channels is None else channels
+        if op == "add":
+            channels.setdefault(guild_id, set()).add(channel_id)
+        else:
+            guild_channels = channels.get(guild_id)
+            if guild_channels:
+                guild_channels.discard(channel_id)
+                if not guild_channels:
+                    del channels[guild_id]
+
+    def _snapshot(self) -> dict:
+        return {"servers": {guild_id: {"like_channels": sorted(channels)} for guild_id, channels in self.channels.items()}}
+
+    def _append(self, line: str):
+        with open(self.log_path, 'a') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _compact(self, snapshot: dict):
+        temp_file = self.path + ".tmp"
+        with open(temp_file, 'w') as f:
+            json.dump(snapshot, f, indent=4)
+        os.replace(temp_file, self.path)
+        self._snapshot_stat = self._stat()  # Our own write, not an external edit
+        # Entries are only appended from this thread, so everything in the log is in the snapshot
+        self._truncate_log()
+
+    def _truncate_log(self):
+        open(self.log_path, 'w').close()
@@ -0,0 +1,60 @@
+# health.py
+import math
+from datetime import datetime, timezone
+
+import metrics
+import startup
+import token_manager
+
+MAX_LOOP_LAG = 1            # Seconds of event-loop lag above which the process is reported unhealthy
+REFRESH_LOOP_GRACE = 300    # Seconds the scheduler may overrun its planned wake-up before it is reported stuck
+
+
+def refresh_loop_status() -> dict:
+    state = token_manager.refresh_loop_state
+    last_check = state["last_check"]
+    next_wake = state["next_wake"]
+    # The loop sleeps at most until next_wake (which stretches with the rate-limit backoff)
+    overdue = (datetime.now(timezone.utc) - next_wake).total_seconds() if next_wake else None
+    return {
+        "running": state["running"],
+        "last_check": last_check.isoformat() if last_check else None,
+        "last_error": state["last_error"],
+        "stuck": state["running"] and overdue is not None and overdue > REFRESH_LOOP_GRACE,
+    }
+
+
+def liveness(bot) -> tuple[bool, dict]:
+    """
+    Alive if the event loop is not lagging. The HTTP server runs on the same loop,
+    so a fully wedged loop shows up as a request timeout for the orchestrator.
+    """
+    lag = metrics.last_loop_lag
+    if lag is None:
+        return True, {"status": "starting", "loop_lag_seconds": None}
+    alive = lag <= MAX_LOOP_LAG
+    return alive, {
+        "status": "ok" if alive else "event loop lagging",
+        "loop_lag_seconds": lag,
+    }
+
+
+def readiness(bot) -> tuple[bool, dict]:
+    """Ready when alive, connected to the gateway and fully initialized."""
+    alive, report = liveness(bot)
+    connected = bot is not None and bot.is_ready() and not bot.is_closed()
+    latency = bot.latency if connected else None
+    if latency is not None and not math.isfinite(latency):
+        latency = None
+    initialized = bot is not None and bot.initialized
+    report.update({
+        "gateway_connected": connected,
+        "gateway_latency_seconds": latency,
+        "initialized": initialized,
+        "token_refresh_loop": refresh_loop_status(),
+        "zones": token_manager.zone_freshness(),
+        "startup": startup.timer.report(),
+    })
+    ready = alive and connected and initialized
+    report["status"] = "ready" if ready else report["status"] if not alive else "not ready"
+    return ready, report
@@ -0,0 +1,40 @@
+# http_client.py
+import os
+import aiohttp
+
+# --- Configuration ---
+HTTP_LIMIT = int(os.getenv("HTTP_LIMIT", 100))                    # Total open connections
+HTTP_LIMIT_PER_HOST = int(os.getenv("HTTP_LIMIT_PER_HOST", 20))   # Open connections per host
+HTTP_DNS_TTL = int(os.getenv("HTTP_DNS_TTL", 300))                # Seconds to cache DNS lookups
+HTTP_KEEPALIVE = int(os.getenv("HTTP_KEEPALIVE", 30))             # Seconds to keep idle connections
+HTTP_TIMEOUT = int(os.getenv("HTTP_TIMEOUT", 15))                 # Default total request timeout
+
+_session = None
+
+
+def get_session() -> aiohttp.ClientSession:
+    """
+    Return the shared ClientSession, creating it on first use.
+    Must be called from inside the running event loop.
+    """
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_LIMIT,
+            limit_per_host=HTTP_LIMIT_PER_HOST,
+            ttl_dns_cache=HTTP_DNS_TTL,
+            keepalive_timeout=HTTP_KEEPALIVE,
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT),
+        )
+    return _session
+
+
+async def close_session():
+    """Close the shared ClientSession and its connection pool."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
@@ -0,0 +1,118 @@
+# launcher.py
+"""
+Sharded deployment: starts WORKERS processes that each run a contiguous range of the
+SHARD_COUNT shards, and restarts any worker that exits.
+
+    SHARD_COUNT=8 WORKERS=4 STATE_BACKEND=sqlite:///seemu_state.db python launcher.py
+
+Worker N serves its HTTP endpoints on PORT + N. Worker 0 is the leader.
+"""
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import time
+
+from dotenv import load_dotenv
+
+import app
+import logs
+import state_backend
+
+load_dotenv()
+
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", 2))
+WORKERS = int(os.getenv("WORKERS", 2))
+RESTART_DELAY = 5           # Seconds before restarting a crashed worker, doubled while it keeps crashing
+MAX_RESTART_DELAY = 300
+STABLE_AFTER = 60           # A worker that ran this long is considered healthy again
+SUPERVISE_INTERVAL = 1
+
+logger = logging.getLogger("launcher")
+
+
+def shard_ranges(shard_count: int, workers: int) -> list[list[int]]:
+    """Split shard ids into `workers` contiguous ranges whose sizes differ by at most one."""
+    size, extra = divmod(shard_count, workers)
+    ranges, start = [], 0
+    for index in range(workers):
+        end = start + size + (1 if index < extra else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+class Worker:
+    def __init__(self, index: int, shard_ids: list[int]):
+        self.index = index
+        self.shard_ids = shard_ids
+        self.process = None
+        self.started_at = None
+        self.restart_delay = RESTART_DELAY
+        self.restart_at = 0.0
+
+    def start(self, context):
+        self.process = context.Process(
+            target=app.run_worker,
+            args=(self.shard_ids, SHARD_COUNT, self.index, WORKERS),
+            name=f"seemu-worker-{self.index}",
+        )
+        self.process.start()
+        self.started_at = time.monotonic()
+        logger.info("Started worker %d (pid %d) with shards %s", self.index, self.process.pid, self.shard_ids)
+
+    def check(self, context):
+        """Restart the worker with exponential backoff if it exited."""
+        if self.process.is_alive():
+            if time.monotonic() - self.started_at >= STABLE_AFTER:
+                self.restart_delay = RESTART_DELAY
+            return
+        now = time.monotonic()
+        if not self.restart_at:
+            logger.warning("Worker %d exited with code %s, restarting in %ds",
+                           self.index, self.process.exitcode, self.restart_delay)
+            self.restart_at = now + self.restart_delay
+            self.restart_delay = min(MAX_RESTART_DELAY, self.restart_delay * 2)
+        elif now >= self.restart_at:
+            self.restart_at = 0.0
+            self.start(context)
+
+    def stop(self, timeout: float = 10):
+        if self.process is not None and self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.kill()
+
+
+def main():
+    logs.setup()
+    if WORKERS < 1 or SHARD_COUNT < WORKERS:
+        logger.critical("Need at least one shard per worker (SHARD_COUNT=%d, WORKERS=%d)", SHARD_COUNT, WORKERS)
+        sys.exit(1)
+    backend = state_backend.STATE_BACKEND or ""
+    if WORKERS > 1 and not backend.startswith(("sqlite:///", "redis://", "rediss://")):
+        logger.critical("Several workers need a shared STATE_BACKEND (sqlite:///path.db or redis://...)")
+        sys.exit(1)
+
+    context = multiprocessing.get_context("spawn")
+    workers = [Worker(index, shard_ids) for index, shard_ids in enumerate(shard_ranges(SHARD_COUNT, WORKERS))]
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        for worker in workers:
+            worker.start(context)
+        while True:
+            time.sleep(SUPERVISE_INTERVAL)
+            for worker in workers:
+                worker.check(context)
+    except KeyboardInterrupt:
+        logger.info("🛑 Stopping workers...")
+    finally:
+        for worker in workers:
+            worker.stop()
+        logs.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+# like_api.py
+import asyncio
+import aiohttp
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from admission import AdmissionController
+from circuit_breaker import CircuitBreaker
+import metrics
+from logs import sampled
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+LIKE_CACHE_SIZE = int(os.getenv("LIKE_CACHE_SIZE", 2048))         # Max (uid, server) entries kept
+LIKE_CACHE_TTL = int(os.getenv("LIKE_CACHE_TTL", 60))             # Seconds a successful result is reused
+LIKE_RESET_HOUR_UTC = int(os.getenv("LIKE_RESET_HOUR_UTC", 0))    # Hour (UTC) when daily like limits reset
+
+
+class _RequestAbandoned(Exception):
+    """Set on a shared request whose caller was cancelled: a waiting caller starts it again."""
+
+
+def seconds_until_reset(now: datetime | None = None) -> float:
+    """Seconds until the next daily like reset."""
+    now = now or datetime.now(timezone.utc)
+    reset = now.replace(hour=LIKE_RESET_HOUR_UTC, minute=0, second=0, microsecond=0)
+    if reset <= now:
+        reset += timedelta(days=1)
+    return (reset - now).total_seconds()
+
+
+class LikeApiClient:
+    """
+    Client for GET {API_URL}/like with an LRU/TTL cache keyed by (uid, server).
+    Concurrent identical requests share a single upstream call, and upstream calls
+    go through an AdmissionController (AdmissionRejected propagates to the caller)
+    and a per-region CircuitBreaker (CircuitOpenError propagates to the caller).
+    With a shared state backend, cached results are also shared with the other worker processes.
+    """
+
+    def __init__(self, api_host: str, session, admission: AdmissionController | None = None, backend=None):
+        self.api_host = api_host
+        self.session = session
+        self.admission = admission or AdmissionController()
+        self.backend = backend
+        self._cache = OrderedDict()   # (uid, server) -> (expires_at, status, data)
+        self._inflight = {}           # (uid, server) -> Future shared by concurrent callers
+        self.breakers = {}            # server -> CircuitBreaker
+
+    async def fetch(self, uid: str, server: str, guild_id=None):
+        """Return (http_status, data). data is the JSON body on 200, the raw text otherwise."""
+        key = (uid, server.upper())
+
+        cached = self._get_cached(key)
+        if cached is None:
+            cached = await self._get_shared(key)
+        if cached is not None:
+            return cached
+
+        future = self._inflight.get(key)
+        if future is not None:
+            try:
+                return await asyncio.shield(future)
+            except _RequestAbandoned:
+                return await self.fetch(uid, server, guild_id)
+
+        future = asyncio.get_running_loop().create_future()
+        # Mark the exception as retrieved when nobody else is waiting on it
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            async with self.admission.slot(guild_id):
+                result = await self._request(uid, server)
+            ttl = self._store(key, *result)
+            future.set_result(result)
+            if ttl is not None:
+                await self._share(key, ttl, *result)
+            return result
+        except asyncio.CancelledError:
+            # Only this caller is cancelled: hand the request over to the ones waiting on it
+            if not future.done():
+                future.set_exception(_RequestAbandoned())
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            del self._inflight[key]
+
+    def breaker(self, server: str) -> CircuitBreaker:
+        server = server.upper()
+        if server not in self.breakers:
+            self.breakers[server] = CircuitBreaker(server)
+        return self.breakers[server]
+
+    async def _request(self, uid: str, server: str):
+        breaker = self.breaker(server)
+        breaker.allow()
+
+        url = f"{self.api_host}/like?uid={uid}&server={server}"
+        timeout = aiohttp.ClientTimeout(total=breaker.latency.timeout())
+        start = time.monotonic()
+        try:
+            async with self.session.get(url, timeout=timeout) as response:
+                if response.status == 200:
+                    result = response.status, await response.json()
+                else:
+                    result = response.status, await response.text()
+        except asyncio.CancelledError:
+            breaker.release()  # Says nothing about the API's health
+            raise
+        except BaseException:
+            breaker.record(time.monotonic() - start, ok=False)
+            metrics.LIKE_API_RESPONSES.inc(region=server.upper(), status="error")
+            raise
+        elapsed = time.monotonic() - start
+        breaker.record(elapsed, ok=result[0] < 500)
+        metrics.LIKE_API_LATENCY.observe(elapsed, region=server.upper())
+        metrics.LIKE_API_RESPONSES.inc(region=server.upper(), status=result[0])
+        logger.debug("Like API call", extra=sampled(0.1, region=server.upper(), status=result[0], latency=round(elapsed, 4)))
+        return result
+
+    def _get_cached(self, key):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, status, data = entry
+        if expires_at <= time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return status, data
+
+    async def _get_shared(self, key):
+        """Look up another worker's result and keep it in the local cache until it expires."""
+        if self.backend is None:
+            return None
+        entry = await self.backend.get("like_cache", f"{key[0]}:{key[1]}")
+        if entry is None:
+            return None
+        expires_at, status, data = entry
+        ttl = expires_at - time.time()
+        if ttl <= 0:
+            return None
+        self._remember(key, ttl, status, data)
+        return status, data
+
+    def _store(self, key, status: int, data) -> float | None:
+        """Cache a result locally. Returns its TTL, or None if it must not be cached."""
+        if status == 200 and isinstance(data, dict) and data.get("status") == 1:
+            ttl = LIKE_CACHE_TTL
+        elif status in (200, 404):
+            # Player not found / max likes reached: nothing changes before the daily reset
+            ttl = seconds_until_reset()
+        else:
+            return None  # Upstream errors are never cached
+
+        self._remember(key, ttl, status, data)
+        return ttl
+
+    async def _share(self, key, ttl: float, status: int, data):
+        """Publish a cached result to the other worker processes. Failures only cost a cache miss there."""
+        if self.backend is None:
+            return
+        try:
+            await self.backend.set("like_cache", f"{key[0]}:{key[1]}", [time.time() + ttl, status, data], ttl)
+        except Exception as e:
+            logger.warning("Failed to share cached like result", extra={"uid": key[0], "server": key[1], "error": str(e)})
+
+    def _remember(self, key, ttl: float, status: int, data):
+        self._cache[key] = (time.monotonic() + ttl, status, data)
+        self._cache.move_to_end(key)
+        while len(self._cache) > LIKE_CACHE_SIZE:
+            self._cache.popitem(last=False)
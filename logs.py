@@ -0,0 +1,148 @@
+# logs.py
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import uuid
+from datetime import datetime, timezone
+
+# --- Configuration ---
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")                  # Root level
+LOG_LEVELS = os.getenv("LOG_LEVELS", "discord=WARNING")     # Per-module levels: "token_manager=DEBUG,like_api=WARNING"
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")                # "json" (one object per line) or "text"
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))    # Records kept before new ones are dropped
+
+correlation_id = contextvars.ContextVar("correlation_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed through `extra` and is emitted as a field
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "correlation_id", "sample_rate"}
+
+_listener = None
+
+
+def new_correlation_id() -> str:
+    """Start a new correlation ID for the current task (and the tasks it creates)."""
+    value = uuid.uuid4().hex[:12]
+    correlation_id.set(value)
+    return value
+
+
+def sampled(rate: float, **fields) -> dict:
+    """`extra` for high-volume events: only a `rate` share of them is kept."""
+    return {"sample_rate": rate, **fields}
+
+
+class ContextFilter(logging.Filter):
+    """Attaches the correlation ID and applies sampling. Runs in the caller, before the queue."""
+
+    def filter(self, record):
+        rate = getattr(record, "sample_rate", None)
+        if rate is not None and rate < 1 and random.random() >= rate:
+            return False
+        record.correlation_id = correlation_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.correlation_id:
+            entry["correlation_id"] = record.correlation_id
+        for key, value in vars(record).items():
+            if key not in _RESERVED:
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s %(message)s")
+
+    def format(self, record):
+        line = super().format(record)
+        fields = {key: value for key, value in vars(record).items() if key not in _RESERVED}
+        if record.correlation_id:
+            fields = {"cid": record.correlation_id, **fields}
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Never blocks the event loop: when the queue is full the record is dropped and counted."""
+
+    dropped = 0
+
+    def prepare(self, record):
+        # Render the message and traceback here (the arguments may change after the call),
+        # but leave the formatting to the writer thread
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _DroppingQueueHandler.dropped += 1
+
+
+def dropped() -> int:
+    """Log records dropped because the queue was full, since the process started."""
+    return _DroppingQueueHandler.dropped
+
+
+def parse_levels(spec: str) -> dict:
+    levels = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, level = part.partition("=")
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup(level: str = LOG_LEVEL, levels: str = LOG_LEVELS, fmt: str = LOG_FORMAT):
+    """
+    Route every logger through a queue: callers only enqueue, and a background thread
+    formats and writes to stdout. Safe to call more than once.
+    """
+    global _listener
+    shutdown()
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+    records = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    queue_handler = _DroppingQueueHandler(records)
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(level.upper())
+    for name, module_level in parse_levels(levels).items():
+        logging.getLogger(name).setLevel(module_level)
+
+    _listener = logging.handlers.QueueListener(records, handler, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown():
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,151 @@
+# metrics.py
+import asyncio
+import logging
+import threading
+import time
+
+import logs
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+LOOP_LAG_INTERVAL = 1   # Seconds between two event-loop lag samples
+
+last_loop_lag = None    # Latest event-loop lag sample, None until the monitor has run
+
+
+def _format_labels(names, values, extra=None) -> str:
+    pairs = list(zip(names, values)) + (extra or [])
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"') for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {value}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        super().__init__(name, help_text, labels)
+        self._function = None
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def set_function(self, function):
+        """Compute the (unlabelled) value at scrape time."""
+        self._function = function
+
+    def render(self) -> list[str]:
+        if self._function is not None:
+            try:
+                self.set(self._function())
+            except Exception as e:
+                logger.warning("Metric %s failed: %s", self.name, e)
+        return super().render()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = buckets
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total, count = self._values.get(key, ([0] * len(self.buckets), 0.0, 0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value, count + 1)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = [(key, list(counts), total, count) for key, (counts, total, count) in self._values.items()]
+        for key, counts, total, count in items:
+            for bound, bucket_count in zip(self.buckets, counts):
+                labels = _format_labels(self.label_names, key, [("le", bound)])
+                lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, [('le', '+Inf')])} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {count}")
+        return lines
+
+
+_registry = []
+
+
+def _register(metric):
+    _registry.append(metric)
+    return metric
+
+
+def render() -> str:
+    """Prometheus text exposition of every registered metric."""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+async def monitor_loop_lag():
+    """Measure how late the event loop wakes up from a fixed sleep."""
+    global last_loop_lag
+    while True:
+        start = time.monotonic()
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        last_loop_lag = max(0.0, time.monotonic() - start - LOOP_LAG_INTERVAL)
+        EVENT_LOOP_LAG.set(last_loop_lag)
+
+
+# --- Metrics ---
+COMMAND_LATENCY = _register(Histogram("bot_command_latency_seconds", "Command handling time", ("command",)))
+COOLDOWN_REJECTIONS = _register(Counter("bot_cooldown_rejections_total", "Commands rejected by a cooldown", ("command",)))
+LIKE_API_LATENCY = _register(Histogram("like_api_latency_seconds", "Like API call latency", ("region",)))
+LIKE_API_RESPONSES = _register(Counter("like_api_responses_total", "Like API responses", ("region", "status")))
+LIKE_API_IN_FLIGHT = _register(Gauge("like_api_in_flight", "Like API calls in flight"))
+LIKE_API_QUEUE_DEPTH = _register(Gauge("like_api_queue_depth", "Like API calls waiting for a slot"))
+LIKE_API_QUEUE_WAIT = _register(Gauge("like_api_queue_wait_seconds", "Moving average of admission wait time"))
+OUTBOUND_QUEUE_DEPTH = _register(Gauge("discord_outbound_queue_depth", "Discord messages waiting to be sent"))
+OUTBOUND_DROPPED = _register(Gauge("discord_outbound_dropped", "Background messages dropped as stale or over capacity"))
+AUTO_LIKE_JOBS = _register(Gauge("auto_like_jobs", "Scheduled auto-like jobs"))
+EVENT_LOOP_LAG = _register(Gauge("event_loop_lag_seconds", "Event loop wake-up delay"))
+GITHUB_API_CALLS = _register(Counter("github_api_calls_total", "GitHub API calls", ("endpoint", "status")))
+GITHUB_RATE_LIMIT_REMAINING = _register(Gauge("github_rate_limit_remaining", "GitHub API requests left in the window"))
+LOG_RECORDS_DROPPED = _register(Gauge("log_records_dropped", "Log records dropped because the log queue was full"))
+LOG_RECORDS_DROPPED.set_function(logs.dropped)
@@ -0,0 +1,162 @@
+# settings.py
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+
+from dotenv import dotenv_values
+
+logger = logging.getLogger(__name__)
+
+ENV_FILE = ".env"
+WATCH_INTERVAL = 5      # Seconds between two checks of watched files
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Settings that can change without a restart. Instances are immutable snapshots."""
+    api_url: str | None
+    auth_url: str | None
+    repo_tokens: str | None
+    github_token: str | None
+    webhook_url: str | None
+    stale_token_hours: int
+    max_tokens: int
+
+
+def _env_file() -> dict:
+    if not os.path.exists(ENV_FILE):
+        return {}
+    return {k: v for k, v in dotenv_values(ENV_FILE).items() if v is not None}
+
+
+# Variables set by the process environment itself, not copied there by load_dotenv(): they keep
+# precedence over ENV_FILE like they do with load_dotenv, even after ENV_FILE is edited
+_initial_env_file = _env_file()
+_process_env = {k: v for k, v in os.environ.items() if _initial_env_file.get(k) != v}
+
+
+def read_settings() -> Settings:
+    """Build a snapshot from ENV_FILE, with variables from the process environment taking precedence."""
+    values = _env_file()
+    values.update(_process_env)
+    return Settings(
+        api_url=values.get("API_URL"),
+        auth_url=values.get("AUTH_URL"),
+        repo_tokens=values.get("REPO_TOKENS"),
+        github_token=values.get("GITHUB_TOKEN"),
+        webhook_url=values.get("WEEBOOK_URL"),
+        stale_token_hours=int(values.get("STALE_TOKEN_HOURS", 6)),
+        max_tokens=int(values.get("MAX_TOKENS", 110)),
+    )
+
+
+def validate(settings: Settings) -> list[str]:
+    errors = []
+    for name in ("api_url", "auth_url"):
+        value = getattr(settings, name)
+        if value and not value.startswith(("http://", "https://")):
+            errors.append(f"{name} must be an http(s) URL")
+    if settings.stale_token_hours <= 0:
+        errors.append("stale_token_hours must be positive")
+    if settings.max_tokens <= 0:
+        errors.append("max_tokens must be positive")
+    return errors
+
+
+_current = read_settings()
+_listeners = []
+
+
+def current() -> Settings:
+    """The active snapshot. Keep a reference for the duration of an operation."""
+    return _current
+
+
+def on_change(callback):
+    """Register callback(old, new), called after each successful reload that changed something."""
+    _listeners.append(callback)
+
+
+def remove_listener(callback):
+    if callback in _listeners:
+        _listeners.remove(callback)
+
+
+def reload() -> tuple[bool, list[str]]:
+    """
+    Re-read and validate the settings, then swap the snapshot in one assignment.
+    Returns (changed, errors); on errors the current snapshot is kept.
+    """
+    global _current
+    try:
+        new = read_settings()
+    except ValueError as e:
+        return False, [str(e)]
+    errors = validate(new)
+    if errors:
+        return False, errors
+    old = _current
+    if new == old:
+        return False, []
+    _current = new
+    for callback in _listeners:
+        try:
+            callback(old, new)
+        except Exception:
+            logger.exception("⚠️ Settings listener failed")
+    return True, []
+
+
+class FileWatcher:
+    """Polls the modification time of files and calls their callbacks when they change."""
+
+    def __init__(self, interval: float = WATCH_INTERVAL):
+        self.interval = interval
+        self._watched = {}      # path -> [mtime, callbacks]
+        self._task = None
+
+    def watch(self, path: str, callback):
+        entry = self._watched.setdefault(path, [self._mtime(path), []])
+        entry[1].append(callback)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    @staticmethod
+    def _mtime(path: str):
+        try:
+            return os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            for path, entry in self._watched.items():
+                mtime = self._mtime(path)
+                if mtime == entry[0]:
+                    continue
+                entry[0] = mtime
+                logger.info("🔄 %s changed, reloading", path)
+                for callback in entry[1]:
+                    try:
+                        callback()
+                    except Exception:
+                        logger.exception("⚠️ Reload of %s failed", path)
+
+
+def _reload_from_file():
+    changed, errors = reload()
+    if errors:
+        logger.warning("⚠️ Invalid settings in %s, keeping the previous ones: %s", ENV_FILE, ", ".join(errors))
+
+
+watcher = FileWatcher()
+watcher.watch(ENV_FILE, _reload_from_file)
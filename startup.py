@@ -0,0 +1,85 @@
+# startup.py
+import hashlib
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+PROCESS_START = time.monotonic()    # Approximately when the interpreter started (this module is imported first)
+
+TREE_HASH_FILE = ".command_tree.json"
+FORCE_SYNC = os.getenv("FORCE_COMMAND_SYNC") == "1"     # Sync the command tree even if it looks unchanged
+
+
+class StartupTimer:
+    """Durations of the startup phases, logged once the bot is ready and reported by /readyz."""
+
+    def __init__(self):
+        self.phases = {}    # name -> seconds, in completion order
+        self.ready_after = None
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.phases[name] = round(time.monotonic() - start, 3)
+
+    def record(self, name: str, seconds: float):
+        self.phases[name] = round(seconds, 3)
+
+    def ready(self):
+        """Mark the bot as serving commands and log the breakdown."""
+        if self.ready_after is not None:
+            return
+        self.ready_after = round(time.monotonic() - PROCESS_START, 3)
+        logger.info("🚀 Ready %.2fs after start", self.ready_after, extra={"phases": dict(self.phases)})
+
+    def report(self) -> dict:
+        return {"ready_after": self.ready_after, "phases": dict(self.phases)}
+
+
+timer = StartupTimer()
+
+
+def command_tree_hash(tree, application_id) -> str:
+    """Stable hash of the application commands that tree.sync() would upload."""
+    payload = []
+    for command in sorted(tree.get_commands(), key=lambda c: c.name):
+        try:
+            payload.append(command.to_dict(tree))   # discord.py >= 2.4
+        except TypeError:
+            payload.append(command.to_dict())
+    data = json.dumps({"application_id": application_id, "commands": payload}, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def _stored_hash() -> str | None:
+    try:
+        with open(TREE_HASH_FILE, "r") as f:
+            return json.load(f).get("hash")
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _store_hash(value: str):
+    temp_file = TREE_HASH_FILE + ".tmp"
+    with open(temp_file, "w") as f:
+        json.dump({"hash": value, "synced_at": time.time()}, f)
+    os.replace(temp_file, TREE_HASH_FILE)
+
+
+async def sync_commands_if_changed(bot) -> bool:
+    """Call tree.sync() only when the command tree differs from the last synced one. Returns True if synced."""
+    current = command_tree_hash(bot.tree, bot.application_id)
+    if not FORCE_SYNC and current == _stored_hash():
+        logger.info("Command tree unchanged, skipping sync")
+        return False
+    await bot.tree.sync()
+    _store_hash(current)
+    logger.info("✅ Command tree synced")
+    return True
@@ -0,0 +1,259 @@
+# state_backend.py
+import asyncio
+import functools
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+STATE_BACKEND = os.getenv("STATE_BACKEND")     # Unset: per-process state in files. "sqlite:///path.db" or "redis://host:port/0"
+SWEEP_INTERVAL = 300                           # Seconds between two purges of expired SQLite rows
+BACKEND_THREADS = int(os.getenv("BACKEND_THREADS", 4))     # Threads running backend calls for the event loop
+ONCE_TTL = 10 * 365 * 24 * 3600                            # Lifetime of claim_once() markers
+
+_backend = None
+_async_backend = None
+
+
+class MemoryBackend:
+    """
+    Namespaced key/value store with optional TTLs, shared by the components of one process.
+    SQLiteBackend and RedisBackend offer the same methods across processes. Values must be JSON-serializable.
+    """
+
+    def __init__(self):
+        self._data = {}     # (namespace, key) -> (value, expires_at or None)
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: str):
+        entry = self._data.get((namespace, key))
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.time():
+            self._data.pop((namespace, key), None)
+            return None
+        return entry[0]
+
+    def set(self, namespace: str, key: str, value, ttl: float | None = None):
+        self._data[(namespace, key)] = (value, time.time() + ttl if ttl else None)
+
+    def delete(self, namespace: str, key: str):
+        self._data.pop((namespace, key), None)
+
+    def items(self, namespace: str) -> dict:
+        now = time.time()
+        return {key: value for (ns, key), (value, expires_at) in list(self._data.items())
+                if ns == namespace and (expires_at is None or expires_at > now)}
+
+    def try_reserve(self, namespace: str, key: str, ttl: float) -> float:
+        """Atomically claim `key` for `ttl` seconds. Returns 0 if claimed, else the seconds left on the current claim."""
+        with self._lock:
+            now = time.time()
+            entry = self._data.get((namespace, key))
+            if entry is not None and entry[1] is not None and entry[1] > now:
+                return entry[1] - now
+            self._data[(namespace, key)] = (1, now + ttl)
+            return 0.0
+
+    def close(self):
+        pass
+
+
+class SQLiteBackend:
+    """Same interface as MemoryBackend, in a local SQLite file shared by every worker process."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db = sqlite3.connect(path, timeout=10, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS kv (namespace TEXT, key TEXT, value TEXT, expires_at REAL, "
+            "PRIMARY KEY (namespace, key))"
+        )
+        self._lock = threading.Lock()
+        self._next_sweep = time.time() + SWEEP_INTERVAL
+
+    def get(self, namespace: str, key: str):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM kv WHERE namespace = ? AND key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, key, time.time()),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, namespace: str, key: str, value, ttl: float | None = None):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO kv (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(value), now + ttl if ttl else None),
+            )
+            if now >= self._next_sweep:
+                self._db.execute("DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+                self._next_sweep = now + SWEEP_INTERVAL
+
+    def delete(self, namespace: str, key: str):
+        with self._lock:
+            self._db.execute("DELETE FROM kv WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def items(self, namespace: str) -> dict:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, value FROM kv WHERE namespace = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, time.time()),
+            ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def try_reserve(self, namespace: str, key: str, ttl: float) -> float:
+        with self._lock:
+            now = time.time()
+            # BEGIN IMMEDIATE takes the write lock, so two processes cannot both claim the key
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT expires_at FROM kv WHERE namespace = ? AND key = ?", (namespace, key)
+                ).fetchone()
+                if row and row[0] is not None and row[0] > now:
+                    return row[0] - now
+                self._db.execute(
+                    "INSERT OR REPLACE INTO kv (namespace, key, value, expires_at) VALUES (?, ?, '1', ?)",
+                    (namespace, key, now + ttl),
+                )
+                return 0.0
+            finally:
+                self._db.execute("COMMIT")
+
+    def close(self):
+        self._db.close()
+
+
+class RedisBackend:
+    """Same interface as MemoryBackend on a Redis-compatible server. Requires the optional `redis` package."""
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("STATE_BACKEND is a redis:// URL but the 'redis' package is not installed")
+        self._redis = redis.Redis.from_url(url)
+
+    @staticmethod
+    def _key(namespace: str, key: str) -> str:
+        return f"seemu:{namespace}:{key}"
+
+    def get(self, namespace: str, key: str):
+        value = self._redis.get(self._key(namespace, key))
+        return json.loads(value) if value is not None else None
+
+    def set(self, namespace: str, key: str, value, ttl: float | None = None):
+        self._redis.set(self._key(namespace, key), json.dumps(value), px=int(ttl * 1000) if ttl else None)
+
+    def delete(self, namespace: str, key: str):
+        self._redis.delete(self._key(namespace, key))
+
+    def items(self, namespace: str) -> dict:
+        prefix = self._key(namespace, "")
+        keys = list(self._redis.scan_iter(match=prefix + "*", count=500))
+        if not keys:
+            return {}
+        return {key.decode()[len(prefix):]: json.loads(value)
+                for key, value in zip(keys, self._redis.mget(keys)) if value is not None}
+
+    def try_reserve(self, namespace: str, key: str, ttl: float) -> float:
+        full_key = self._key(namespace, key)
+        if self._redis.set(full_key, "1", nx=True, px=int(ttl * 1000)):
+            return 0.0
+        remaining = self._redis.pttl(full_key)
+        return max(remaining, 0) / 1000
+
+    def close(self):
+        self._redis.close()
+
+
+class AsyncBackend:
+    """
+    Awaitable view of a backend for code running on the event loop. Each call runs on a small
+    thread pool, so SQLite locks and Redis round trips never stall other commands.
+    """
+
+    def __init__(self, backend, workers: int = BACKEND_THREADS):
+        self.backend = backend
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="state-backend")
+
+    async def _call(self, method, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(method, *args, **kwargs))
+
+    async def get(self, namespace: str, key: str):
+        return await self._call(self.backend.get, namespace, key)
+
+    async def set(self, namespace: str, key: str, value, ttl: float | None = None):
+        await self._call(self.backend.set, namespace, key, value, ttl)
+
+    async def delete(self, namespace: str, key: str):
+        await self._call(self.backend.delete, namespace, key)
+
+    async def items(self, namespace: str) -> dict:
+        return await self._call(self.backend.items, namespace)
+
+    async def try_reserve(self, namespace: str, key: str, ttl: float) -> float:
+        return await self._call(self.backend.try_reserve, namespace, key, ttl)
+
+    async def claim_once(self, name: str) -> bool:
+        """True for the first caller ever, across every worker process (e.g. for one-time imports)."""
+        return await self.try_reserve("once", name, ONCE_TTL) == 0
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.backend.close()
+
+
+def create_backend(url: str):
+    if url.startswith("memory://"):
+        return MemoryBackend()
+    if url.startswith("sqlite:///"):
+        return SQLiteBackend(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://")):
+        return RedisBackend(url)
+    raise ValueError(f"Unsupported STATE_BACKEND: {url}")
+
+
+def get_backend():
+    """The process-wide backend from STATE_BACKEND, or None when state stays local to the process."""
+    global _backend, STATE_BACKEND
+    if _backend is None and STATE_BACKEND:
+        if STATE_BACKEND.startswith("memory://"):
+            # Nothing would be persisted: auto-like jobs and like channels would be lost on restart
+            logger.warning("STATE_BACKEND=memory:// keeps no state across restarts, using the local files instead")
+            STATE_BACKEND = None
+            return None
+        _backend = create_backend(STATE_BACKEND)
+    return _backend
+
+
+def get_async_backend() -> AsyncBackend | None:
+    """get_backend() wrapped for the event loop, or None when state stays local to the process."""
+    global _async_backend
+    backend = get_backend()
+    if backend is None:
+        return None
+    if _async_backend is None or _async_backend.backend is not backend:
+        _async_backend = AsyncBackend(backend)
+    return _async_backend
+
+
+def close():
+    """Close the process-wide backend and its thread pool, on shutdown."""
+    global _backend, _async_backend
+    if _async_backend is not None:
+        _async_backend.close()
+    elif _backend is not None:
+        _backend.close()
+    _backend = _async_backend = None
@@ -0,0 +1,30 @@
+import json
+
+import pytest
+
+from config_loader import iter_records
+
+
+def records(tmp_path, text: str, chunk_size: int) -> list:
+    path = tmp_path / "config.json"
+    path.write_text(text, encoding="utf-8")
+    return [record for _, record in iter_records(str(path), chunk_size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64 * 1024])
+def test_numbers_split_across_chunks(tmp_path, chunk_size):
+    text = '[1.5e3, -12, 0.25 , 7e-2,{"uid": 123, "password": "x"}, "a,b", true, null]'
+    assert records(tmp_path, text, chunk_size) == json.loads(text)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_empty_and_nested_arrays(tmp_path, chunk_size):
+    assert records(tmp_path, " [ ] ", chunk_size) == []
+    assert records(tmp_path, "[[1, 2], []]", chunk_size) == [[1, 2], []]
+
+
+@pytest.mark.parametrize("text", ["[1,,2]", "[,1]", "[1,]", "[1 2]", "[1", '{"a": 1}', "[1.5e]"])
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_malformed_arrays_are_rejected(tmp_path, text, chunk_size):
+    with pytest.raises(ValueError):
+        records(tmp_path, text, chunk_size)
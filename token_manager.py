@@ -1,12 +1,20 @@
 # token_manager.py
+import logging
 import os
 import json
-import requests  # Needed for notify_discord
 from base64 import b64encode
 from datetime import datetime, timedelta, timezone
 import asyncio
+import random
 from dotenv import load_dotenv
 import aiohttp
+from webhook_notifier import WebhookNotifier
+from token_store import TokenStore
+from config_loader import AccountLoader
+import metrics
+import settings
+
+logger = logging.getLogger(__name__)
 
 load_dotenv()
 
@@ -17,65 +25,195 @@ ZONES = ["br", "ind", "bd"]
 
 LOCAL_CONFIG_DIR = "configs"
 
-REPO_TOKENS = os.getenv("REPO_TOKENS")
-AUTH_URL = os.getenv("AUTH_URL")
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
-WEEBOOK_URL = os.getenv("WEEBOOK_URL")
+# Hot-reloadable, see apply_settings
+_settings = settings.current()
+REPO_TOKENS = _settings.repo_tokens
+AUTH_URL = _settings.auth_url
+GITHUB_TOKEN = _settings.github_token
+WEEBOOK_URL = _settings.webhook_url
+
+STALE_TOKEN_HOURS = _settings.stale_token_hours
+MAX_TOKENS = _settings.max_tokens
+
+ROTATION_MARGIN_HOURS = 1   # Tokens are renewed this long before they reach STALE_TOKEN_HOURS
+TOKEN_GRACE_HOURS = 2       # Tokens stay in the file this long past STALE_TOKEN_HOURS while their renewal runs
+ROTATION_BATCH = 25         # Max accounts renewed per cycle, so each cycle stays short
+FAILURE_BACKOFF = 900       # Seconds before retrying a failed account, doubled per failure
+MAX_FAILURE_BACKOFF = 86400
+
+POLL_INTERVAL = 60          # Seconds between freshness checks while the rate limit is healthy
+MAX_POLL_INTERVAL = 900     # Upper bound when backing off
+RATE_LIMIT_LOW = 500        # Below this many remaining GitHub calls, polling slows down
+RESYNC_INTERVAL = 1800      # Seconds between two commit-time syncs with GitHub
+REFRESH_JITTER = 300        # Max random delay (seconds) added to each zone's refresh time
+REFRESH_RETRY = 600         # Seconds before retrying a zone whose refresh failed
+
+def github_headers(github_token: str | None) -> dict:
+    return {
+        "Authorization": f"token {github_token}",
+        "Accept": "application/vnd.github.v3+json"
+    }
+
 
-STALE_TOKEN_HOURS = 6      
-MAX_TOKENS = 110           
+HEADERS = github_headers(GITHUB_TOKEN)
 
-HEADERS = {
-    "Authorization": f"token {GITHUB_TOKEN}",
-    "Accept": "application/vnd.github.v3+json"
-}
+notifier = WebhookNotifier(WEEBOOK_URL)
+account_loader = AccountLoader(report=lambda message: notify_discord(message))
 
 # Store last commit times for each zone
 last_commit_times = {zone: None for zone in ZONES}
 
+# Status of the check_token_validity loop, reported by the health endpoints
+refresh_loop_state = {"running": False, "last_check": None, "last_error": None, "next_wake": None}
+
+# Refresh scheduling state per zone
+zone_refresh_tasks = {}
+zone_jitter = {zone: random.uniform(0, REFRESH_JITTER) for zone in ZONES}
+zone_retry_at = {zone: None for zone in ZONES}
+refresh_wakeup = asyncio.Event()
+
+# Conditional-request cache: url -> {"etag", "last_modified", "body"}
+github_cache = {}
+
+# Last rate-limit headers seen from GitHub
+github_rate_limit = {"remaining": None, "reset": None}
+
+
+def apply_settings(old, new):
+    """Swap in reloaded settings. Each global is replaced in one assignment."""
+    global REPO_TOKENS, AUTH_URL, GITHUB_TOKEN, WEEBOOK_URL, STALE_TOKEN_HOURS, MAX_TOKENS, HEADERS
+    if (new.repo_tokens, new.github_token) != (old.repo_tokens, old.github_token):
+        github_cache.clear()  # Cached responses belong to the previous repository or credentials
+    REPO_TOKENS = new.repo_tokens
+    AUTH_URL = new.auth_url
+    GITHUB_TOKEN = new.github_token
+    HEADERS = github_headers(new.github_token)
+    WEEBOOK_URL = new.webhook_url
+    notifier.url = new.webhook_url
+    STALE_TOKEN_HOURS = new.stale_token_hours
+    MAX_TOKENS = new.max_tokens
+
+
+settings.on_change(apply_settings)
+
+
+def record_github_call(response, endpoint: str):
+    """Count a GitHub API call and track the remaining rate limit."""
+    metrics.GITHUB_API_CALLS.inc(endpoint=endpoint, status=response.status)
+    remaining = response.headers.get("X-RateLimit-Remaining")
+    if remaining is not None:
+        github_rate_limit["remaining"] = int(remaining)
+        metrics.GITHUB_RATE_LIMIT_REMAINING.set(int(remaining))
+    reset = response.headers.get("X-RateLimit-Reset")
+    if reset is not None:
+        github_rate_limit["reset"] = int(reset)
+
+
+async def github_get(session, url: str, endpoint: str):
+    """
+    GET a GitHub API url with If-None-Match / If-Modified-Since.
+    A 304 is served from github_cache and does not count against the rate limit.
+    Returns (status, json_body); status is 200 for cache hits.
+    """
+    cached = github_cache.get(url)
+    headers = dict(HEADERS)
+    if cached:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    async with session.get(url, headers=headers) as response:
+        record_github_call(response, endpoint)
+        if response.status == 304 and cached:
+            return 200, cached["body"]
+        if response.status != 200:
+            github_cache.pop(url, None)
+            return response.status, None
+        body = await response.json()
+        github_cache[url] = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "body": body,
+        }
+        return 200, body
+
+
+def poll_interval() -> float:
+    """Seconds to wait before the next freshness poll, backing off when the rate limit runs low."""
+    remaining, reset = github_rate_limit["remaining"], github_rate_limit["reset"]
+    if remaining is None or reset is None or remaining >= RATE_LIMIT_LOW:
+        return POLL_INTERVAL
+    until_reset = max(0.0, reset - datetime.now(timezone.utc).timestamp())
+    # Spread the remaining calls (one gate + one per zone in the worst case) over the window
+    spread = until_reset * (len(ZONES) + 1) / max(1, remaining)
+    return min(MAX_POLL_INTERVAL, max(POLL_INTERVAL, spread))
+
 
 def notify_discord(message: str):
-    """Send a notification to Discord via webhook."""
-    if not WEEBOOK_URL:
-        print("[Discord] Notification skipped.")
-        return
-    try:
-        requests.post(WEEBOOK_URL, json={"content": message}, timeout=5)
-    except Exception as e:
-        print(f"[Discord] Error: {e}")
+    """Queue a notification for the Discord webhook without blocking the event loop."""
+    notifier.notify(message)
 
 
 async def get_github_file_content(session, repo: str, path: str):
     """Get file content from GitHub repository and return (content, sha)."""
     url = f"{GITHUB_API}/repos/{repo}/contents/{path}"
-    async with session.get(url, headers=HEADERS) as response:
-        if response.status == 200:
-            file_info = await response.json()
-            # Download raw content
-            download_url = file_info.get('download_url')
-            if download_url:
-                async with session.get(download_url, timeout=10) as content_response:
-                    if content_response.status == 200:
-                        content = await content_response.text()
-                        return content, file_info['sha']
-            return None, file_info.get('sha')
+    status, file_info = await github_get(session, url, "contents")
+    if status == 200:
+        # Download raw content
+        download_url = file_info.get('download_url')
+        if download_url:
+            async with session.get(download_url, timeout=10) as content_response:
+                if content_response.status == 200:
+                    content = await content_response.text()
+                    return content, file_info['sha']
+        return None, file_info.get('sha')
     return None, None
 
 
 async def get_github_file_commit_info(session, repo: str, path: str):
     """Get the last commit date for a given file on GitHub."""
     url = f"{GITHUB_API}/repos/{repo}/commits?path={path}&page=1&per_page=1"
-    async with session.get(url, headers=HEADERS) as response:
-        if response.status == 200:
-            commits = await response.json()
-            if commits:
-                date_str = commits[0]['commit']['committer']['date']
-                return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+    status, commits = await github_get(session, url, "commits")
+    if status == 200 and commits:
+        date_str = commits[0]['commit']['committer']['date']
+        return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
     return None
 
 
+async def get_zones_commit_info(session) -> dict:
+    """
+    Last commit date of every zone's token file, as {zone: datetime | None}.
+    One conditional request on the tokens/ directory history gates the per-zone queries:
+    when it returns 304 nothing changed and the cached dates are reused.
+    """
+    gate_url = f"{GITHUB_API}/repos/{REPO_TOKENS}/commits?sha={BRANCH}&path=tokens&page=1&per_page=1"
+    gate_cached = gate_url in github_cache
+    previous_head = github_cache[gate_url]["body"] if gate_cached else None
+    status, head = await github_get(session, gate_url, "commits")
+
+    if status == 200 and gate_cached and head == previous_head and all(last_commit_times[z] for z in ZONES):
+        return dict(last_commit_times)
+
+    dates = await asyncio.gather(*(
+        get_github_file_commit_info(session, REPO_TOKENS, f"tokens/token_{zone}.json") for zone in ZONES
+    ))
+    result = dict(zip(ZONES, dates))
+    for zone, date in result.items():
+        if date and (last_commit_times[zone] is None or date > last_commit_times[zone]):
+            last_commit_times[zone] = date
+    return result
+
+
+async def get_github_file_sha(session, repo: str, path: str):
+    """Get the current SHA of a file on GitHub, without downloading its raw content."""
+    url = f"{GITHUB_API}/repos/{repo}/contents/{path}"
+    status, file_info = await github_get(session, url, "contents")
+    return file_info.get('sha') if status == 200 else None
+
+
 async def update_github_file(session, repo: str, path: str, content: str, sha: str | None):
-    """Update a file on GitHub repository."""
+    """Update a file on GitHub repository. Returns (status, new_sha); status is 0 on network errors."""
     url = f"{GITHUB_API}/repos/{repo}/contents/{path}"
     data = {
         "message": f"Auto update {path} @ {datetime.now(timezone.utc).isoformat()}",
@@ -85,10 +223,31 @@ async def update_github_file(session, repo: str, path: str, content: str, sha: s
     }
     try:
         async with session.put(url, headers=HEADERS, data=json.dumps(data)) as r:
-            return r.status in [200, 201]
+            record_github_call(r, "contents_update")
+            if r.status in [200, 201]:
+                return r.status, (await r.json())["content"]["sha"]
+            return r.status, None
     except Exception as e:
-        print(f"Update error for {path}: {e}")
-        return False
+        logger.warning("GitHub update failed", extra={"path": path, "error": str(e)})
+        return 0, None
+
+
+async def push_zone_tokens(session, zone: str, tokens: list, sha: str | None):
+    """TokenStore push callback: write a zone's token file to REPO_TOKENS."""
+    token_path = f"tokens/token_{zone}.json"
+    status, new_sha = await update_github_file(session, REPO_TOKENS, token_path, json.dumps(tokens, indent=2), sha)
+    if status in [200, 201]:
+        last_commit_times[zone] = datetime.now(timezone.utc)
+        notify_discord(f"✅ `{token_path}` synced to GitHub with {len(tokens)} tokens.")
+    return status, new_sha
+
+
+async def fetch_zone_sha(session, zone: str):
+    """TokenStore conflict callback: current SHA of a zone's token file."""
+    return await get_github_file_sha(session, REPO_TOKENS, f"tokens/token_{zone}.json")
+
+
+token_store = TokenStore(push_zone_tokens, fetch_zone_sha)
 
 
 async def get_auth_token(session, uid: str, password: str):
@@ -102,102 +261,281 @@ async def get_auth_token(session, uid: str, password: str):
         return None
 
 
-async def refresh_zone(session, zone: str):
+def rotate_after() -> timedelta:
+    """Age at which a token is renewed, derived from the hot-reloadable STALE_TOKEN_HOURS."""
+    return timedelta(hours=max(STALE_TOKEN_HOURS - ROTATION_MARGIN_HOURS, STALE_TOKEN_HOURS / 2))
+
+
+def token_lifetime() -> timedelta:
+    """Age at which a token is dropped from the token file."""
+    return timedelta(hours=STALE_TOKEN_HOURS + TOKEN_GRACE_HOURS)
+
+
+def account_due_time(meta: dict | None) -> datetime:
+    """When an account's token should be renewed next."""
+    if not meta:
+        return datetime.min.replace(tzinfo=timezone.utc)
+    if meta.get("retry_at"):
+        return datetime.fromisoformat(meta["retry_at"])
+    if not meta.get("token"):
+        return datetime.min.replace(tzinfo=timezone.utc)
+    return datetime.fromisoformat(meta["issued_at"]) + rotate_after()
+
+
+def active_tokens(accounts: dict, now: datetime) -> list:
+    """Token file content: every token still inside its lifetime, imported ones last, at most MAX_TOKENS."""
+    lifetime = token_lifetime()
+    live = [meta for meta in accounts.values()
+            if meta.get("token") and now - datetime.fromisoformat(meta["issued_at"]) < lifetime]
+    live.sort(key=lambda meta: bool(meta.get("imported")))
+    return [{"token": meta["token"]} for meta in live[:MAX_TOKENS]]
+
+
+async def import_zone_tokens(session, zone: str) -> dict:
+    """
+    Tokens published before accounts were tracked, as pseudo-accounts "imported:N" that are
+    never renewed. They stay in the file until they expire, so a partial first batch does not replace it.
+    """
+    tokens = token_store.get_tokens(zone)
+    issued_at = token_store.updated_at(zone)
+    if not tokens:
+        token_path = f"tokens/token_{zone}.json"
+        content, _ = await get_github_file_content(session, REPO_TOKENS, token_path)
+        try:
+            tokens = json.loads(content) if content else []
+        except ValueError:
+            tokens = []
+        issued_at = await get_github_file_commit_info(session, REPO_TOKENS, token_path)
+    issued_at = (issued_at or datetime.now(timezone.utc)).isoformat()
+    return {
+        f"imported:{index}": {"token": entry["token"], "issued_at": issued_at, "imported": True}
+        for index, entry in enumerate(tokens)
+        if isinstance(entry, dict) and entry.get("token")
+    }
+
+
+async def refresh_zone(session, zone: str) -> bool:
+    """
+    Renew the zone's tokens that are close to expiry (at most ROTATION_BATCH per call).
+    Valid tokens stay in the file meanwhile, including the ones published before accounts were
+    tracked (imported on the first pass). Returns False if nothing could be written.
+    """
     zone = zone.lower()
     if zone not in ZONES:
         notify_discord(f"❌ Unknown zone: {zone}")
-        return
+        return False
 
     try:
         config_path = os.path.join(LOCAL_CONFIG_DIR, f"config_{zone}.json")
         token_path = f"tokens/token_{zone}.json"
-        
-        notify_discord(f"⏳ Refreshing `{zone}` tokens...")
 
         # Check if local config exists
         if not os.path.exists(config_path):
             notify_discord(f"❌ Config file not found: {config_path}")
-            return
-
-        # Load local config accounts
-        with open(config_path, "r", encoding="utf-8") as f:
-            config_data = json.load(f)
+            return False
+
+        # Load local config accounts, limited to MAX_TOKENS (cached until the file changes)
+        configured = {str(acc['uid']): acc for acc in account_loader.load(config_path, MAX_TOKENS)}
+
+        stored = token_store.get_accounts(zone)
+        if not stored:
+            stored = await import_zone_tokens(session, zone)
+            if stored:
+                logger.info("Imported existing tokens", extra={"zone": zone, "count": len(stored)})
+
+        # Forget accounts removed from the config and imported tokens past their lifetime
+        now = datetime.now(timezone.utc)
+        lifetime = token_lifetime()
+        accounts = {
+            uid: dict(meta) for uid, meta in stored.items()
+            if uid in configured
+            or (meta.get("imported") and now - datetime.fromisoformat(meta["issued_at"]) < lifetime)
+        }
+        # Accounts without a token yet are due now, so next_rotation_time sees them
+        for uid in configured:
+            accounts.setdefault(uid, {"token": None, "issued_at": None, "failures": 0, "retry_at": None})
+
+        due = sorted((uid for uid in configured if account_due_time(accounts.get(uid)) <= now),
+                     key=lambda uid: account_due_time(accounts.get(uid)))[:ROTATION_BATCH]
+        if not due:
+            if accounts != stored:
+                token_store.save_accounts(zone, accounts)
+            return True
+
+        notify_discord(f"⏳ Renewing {len(due)} `{zone}` tokens...")
 
-        # Limit accounts to MAX_TOKENS
-        accounts = config_data[:MAX_TOKENS]
-
-        tokens = []
         count_success = 0
         count_fail = 0
-        processed_count = 0
-
-        # Generate tokens for accounts
-        for acc in accounts:
-            if 'uid' in acc and 'password' in acc:
-                processed_count += 1
-                token = await get_auth_token(session, acc['uid'], acc['password'])
-                if token:
-                    tokens.append({"token": token})
-                    count_success += 1
-                else:
-                    count_fail += 1
+
+        for processed_count, uid in enumerate(due, start=1):
+            acc = configured[uid]
+            meta = accounts[uid]
+            token = await get_auth_token(session, acc['uid'], acc['password'])
+            if token:
+                meta.update(token=token, issued_at=datetime.now(timezone.utc).isoformat(), failures=0, retry_at=None)
+                count_success += 1
+            else:
+                # Back off exponentially so a broken account is not retried every cycle
+                meta["failures"] = meta.get("failures", 0) + 1
+                backoff = min(MAX_FAILURE_BACKOFF, FAILURE_BACKOFF * 2 ** (meta["failures"] - 1))
+                meta["retry_at"] = (datetime.now(timezone.utc) + timedelta(seconds=backoff)).isoformat()
+                count_fail += 1
             if processed_count % 20 == 0:
-                notify_discord(f"🔄 `{zone}`: {processed_count} tokens traités sur {len(accounts)}.")
+                notify_discord(f"🔄 `{zone}`: {processed_count} tokens traités sur {len(due)}.")
 
         notify_discord(f"🔄 `{zone}`: {count_success} tokens OK, {count_fail} failed.")
 
-        # Get current SHA of token file
-        _, sha = await get_github_file_content(session, REPO_TOKENS, token_path)
+        if count_success == 0:
+            # Nothing new to publish: keep the current file, only remember the failures
+            token_store.save_accounts(zone, accounts)
+            return count_fail == 0
 
-        # Update token file on GitHub
-        updated = await update_github_file(session, REPO_TOKENS, token_path, json.dumps(tokens, indent=2), sha)
+        tokens = active_tokens(accounts, datetime.now(timezone.utc))
 
-        if updated:
-            last_commit_times[zone] = datetime.now(timezone.utc)
-            notify_discord(f"✅ `{token_path}` updated with {len(tokens)} tokens.")
-        else:
-            notify_discord(f"⚠️ Failed to update `{token_path}`.")
+        # Store locally; the push to GitHub happens in the background
+        token_store.put(session, zone, tokens, accounts)
+        notify_discord(f"✅ `{token_path}` updated locally with {len(tokens)} tokens, sync queued.")
+        return True
     except Exception as e:
         notify_discord(f"❌ Error in zone `{zone}`: {str(e)}")
+        return False
+
+
+def next_rotation_time(zone: str) -> datetime | None:
+    """Earliest renewal time among the zone's known accounts, or None if none are tracked yet."""
+    accounts = [meta for meta in token_store.get_accounts(zone).values() if not meta.get("imported")]
+    if not accounts:
+        return None
+    return min(account_due_time(meta) for meta in accounts)
+
+
+def start_zone_refresh(session, zone: str) -> asyncio.Task:
+    """Start refreshing a zone, or return the refresh already running for it."""
+    task = zone_refresh_tasks.get(zone)
+    if task is not None and not task.done():
+        return task
+
+    async def run():
+        updated = await refresh_zone(session, zone)
+        zone_jitter[zone] = random.uniform(0, REFRESH_JITTER)
+        zone_retry_at[zone] = None if updated else datetime.now(timezone.utc) + timedelta(seconds=REFRESH_RETRY)
+        refresh_wakeup.set()
+        return updated
+
+    task = asyncio.create_task(run())
+    zone_refresh_tasks[zone] = task
+    return task
+
+
+def zone_due_time(zone: str) -> datetime | None:
+    """When the zone's tokens should be rotated next, or None if nothing is known about the zone."""
+    rotation_dt = next_rotation_time(zone)
+    if rotation_dt is not None:
+        due = rotation_dt + timedelta(seconds=zone_jitter[zone])
+    else:
+        # No per-account data yet (e.g. the file was produced elsewhere): fall back to the commit time
+        commit_dt = last_commit_times[zone]
+        if commit_dt is None:
+            return None
+        due = commit_dt + timedelta(hours=STALE_TOKEN_HOURS, seconds=zone_jitter[zone])
+    retry_at = zone_retry_at[zone]
+    return max(due, retry_at) if retry_at else due
 
 
 async def check_and_refresh_on_startup(session):
     """
-    Checks if token files exist on GitHub for each zone.
-    If a file is missing, it triggers a refresh for that specific zone.
+    Checks if token files exist for each zone, locally first and on GitHub otherwise.
+    If a file is missing, it triggers a refresh for that specific zone; missing zones are refreshed concurrently.
     """
+    token_store.resume_pending(session, ZONES)
     for zone in ZONES:
-        token_path = f"tokens/token_{zone}.json"
-        if not await github_file_exists(session, token_path):
+        last_commit_times[zone] = token_store.synced_at(zone)
+
+    commit_times = dict(last_commit_times)
+    if not all(commit_times.values()):
+        commit_times = await get_zones_commit_info(session)
+
+    refreshes = []
+    for zone in ZONES:
+        if commit_times[zone] is None:
             notify_discord("`                                     `")
             notify_discord(f"⚠️ No token file found for `{zone}`. Generating now...")
-            await refresh_zone(session, zone)
+            refreshes.append(start_zone_refresh(session, zone))
         else:
             notify_discord(f"✅ Token file found for `{zone}`. Skipping initial refresh.")
+    await asyncio.gather(*refreshes)
 
 
 async def check_token_validity(session):
-
-    while True:
-        for zone in ZONES:
-            token_path = f"tokens/token_{zone}.json"
-            commit_dt = await get_github_file_commit_info(session, REPO_TOKENS, token_path)
-
-            if commit_dt:
-                time_diff = datetime.now(timezone.utc) - commit_dt
-
-                is_stale = time_diff > timedelta(hours=STALE_TOKEN_HOURS)
-                if is_stale:
-                    notify_discord("`                                     `")
-                    notify_discord(f"⚠️ Tokens `{zone}` expired. Refreshing...")
-                    await refresh_zone(session, zone)
-
-
-        await asyncio.sleep(60)  
-
-
-
-async def github_file_exists(session, filename: str) -> bool:
-    url = f"https://api.github.com/repos/{REPO_TOKENS}/contents/{filename}"
-    async with session.get(url, headers=HEADERS) as response:
-        return response.status == 200
+    """
+    Refresh scheduler: sleeps until the next zone is due (oldest token + rotate_after() + jitter,
+    or last commit + STALE_TOKEN_HOURS + jitter for zones without per-account data)
+    and refreshes each zone in its own task, so a slow zone never delays the others.
+    Commit times are re-synced with GitHub every RESYNC_INTERVAL, or less often while the rate limit is low.
+    """
+    refresh_loop_state["running"] = True
+    # On a warm restart every zone is known locally, so GitHub is not queried right away
+    next_sync = datetime.now(timezone.utc)
+    if all(last_commit_times.values()):
+        next_sync += timedelta(seconds=RESYNC_INTERVAL)
+    try:
+        while True:
+            now = datetime.now(timezone.utc)
+            try:
+                # Pushes that gave up are retried here, so the file does not stay stale until the next write
+                token_store.resume_pending(session, ZONES)
+                if now >= next_sync:
+                    await get_zones_commit_info(session)
+                    # Stretched by the same factor as the polling backoff when the rate limit runs low
+                    next_sync = now + timedelta(seconds=RESYNC_INTERVAL * poll_interval() / POLL_INTERVAL)
+
+                for zone in ZONES:
+                    due = zone_due_time(zone)
+                    task = zone_refresh_tasks.get(zone)
+                    if due and due <= now and (task is None or task.done()):
+                        notify_discord("`                                     `")
+                        notify_discord(f"⚠️ Tokens `{zone}` due for renewal. Refreshing...")
+                        start_zone_refresh(session, zone)
+
+                refresh_loop_state["last_check"] = now
+                refresh_loop_state["last_error"] = None
+            except Exception as e:
+                refresh_loop_state["last_error"] = str(e)
+                logger.exception("Token validity check failed")
+
+            # Sleep until the next zone is due or the next sync, unless a refresh finishes first
+            wake_at = next_sync
+            for zone in ZONES:
+                due = zone_due_time(zone)
+                task = zone_refresh_tasks.get(zone)
+                if due and (task is None or task.done()):
+                    wake_at = min(wake_at, due)
+            refresh_wakeup.clear()
+            timeout = max(1.0, (wake_at - datetime.now(timezone.utc)).total_seconds())
+            refresh_loop_state["next_wake"] = datetime.now(timezone.utc) + timedelta(seconds=timeout)
+            # Not wait_for: it drops a cancellation that arrives in the same tick as the wakeup
+            waiter = asyncio.ensure_future(refresh_wakeup.wait())
+            try:
+                await asyncio.wait({waiter}, timeout=timeout)
+            finally:
+                waiter.cancel()
+    finally:
+        refresh_loop_state["running"] = False
+
+
+def zone_freshness() -> dict:
+    """Age of each zone's token file on GitHub, based on the last known commit or successful push."""
+    now = datetime.now(timezone.utc)
+    report = {}
+    for zone in ZONES:
+        commit_dt = last_commit_times[zone]
+        if commit_dt is None:
+            report[zone] = {"last_commit": None, "age_seconds": None, "fresh": None}
+            continue
+        age = now - commit_dt
+        report[zone] = {
+            "last_commit": commit_dt.isoformat(),
+            "age_seconds": int(age.total_seconds()),
+            "fresh": age <= timedelta(hours=STALE_TOKEN_HOURS),
+        }
+    return report
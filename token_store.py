@@ -0,0 +1,144 @@
+# token_store.py
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime, timezone
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+LOCAL_TOKEN_DIR = "tokens"
+SYNC_RETRIES = 5        # Attempts before a sync is given up until the next write or resume_pending()
+SYNC_BACKOFF = 5        # Seconds before the first retry, doubled on each attempt
+
+
+class TokenStore:
+    """
+    Local on-disk and in-memory copy of every zone's token file.
+    Writes land locally first and are pushed to GitHub in the background (write-behind)
+    with the last known SHA, refreshing the SHA and retrying on conflicts.
+
+    push(session, zone, tokens, sha) -> (status, new_sha) and fetch_sha(session, zone) -> sha
+    are provided by the caller so this module does not depend on the GitHub client.
+    """
+
+    def __init__(self, push, fetch_sha, directory: str = LOCAL_TOKEN_DIR):
+        self.push = push
+        self.fetch_sha = fetch_sha
+        self.directory = directory
+        self.zones = {}         # zone -> {"tokens", "accounts", "sha", "updated_at", "synced", "synced_at"}
+        self._sync_tasks = {}   # zone -> running sync task
+        self._dirty = set()     # zones written again while a sync was running
+
+    def _path(self, zone: str) -> str:
+        return os.path.join(self.directory, f"{zone}.json")
+
+    def load(self, zone: str) -> dict | None:
+        """Return the zone state, reading it from disk on first access."""
+        if zone in self.zones:
+            return self.zones[zone]
+        path = self._path(zone)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding="utf-8") as f:
+                state = json.load(f)
+        except json.JSONDecodeError:
+            logger.warning("Local token file %s is corrupt or empty, ignoring it", path)
+            return None
+        self.zones[zone] = state
+        return state
+
+    def get_tokens(self, zone: str) -> list:
+        state = self.load(zone)
+        return state["tokens"] if state else []
+
+    def get_accounts(self, zone: str) -> dict:
+        """Per-account token metadata: uid -> {"token", "issued_at", "failures", "retry_at"}."""
+        state = self.load(zone)
+        return state.get("accounts", {}) if state else {}
+
+    def updated_at(self, zone: str) -> datetime | None:
+        """When tokens were last written locally, or None if the zone has none yet."""
+        state = self.load(zone)
+        return datetime.fromisoformat(state["updated_at"]) if state and state.get("updated_at") else None
+
+    def synced_at(self, zone: str) -> datetime | None:
+        """When the zone's tokens last reached GitHub, or None if they never did."""
+        state = self.load(zone)
+        if not state:
+            return None
+        if "synced_at" not in state:
+            # Written before pushes were timestamped
+            return self.updated_at(zone) if state.get("synced") else None
+        return datetime.fromisoformat(state["synced_at"]) if state["synced_at"] else None
+
+    def put(self, session, zone: str, tokens: list, accounts: dict | None = None):
+        """Store tokens (and optionally their account metadata) locally and schedule a push to GitHub."""
+        state = self.load(zone) or self.zones.setdefault(zone, {"sha": None, "synced_at": None})
+        state.update(tokens=tokens, updated_at=datetime.now(timezone.utc).isoformat(), synced=False)
+        if accounts is not None:
+            state["accounts"] = accounts
+        self._save(zone)
+        self.schedule_sync(session, zone)
+
+    def save_accounts(self, zone: str, accounts: dict):
+        """Store account metadata locally without touching the tokens or pushing to GitHub."""
+        # A new zone has no tokens yet: leave it unstamped so it is not mistaken for a fresh token file
+        state = self.load(zone) or self.zones.setdefault(zone, {"sha": None, "tokens": [], "synced": True,
+                                                               "updated_at": None, "synced_at": None})
+        state["accounts"] = accounts
+        self._save(zone)
+
+    def schedule_sync(self, session, zone: str):
+        task = self._sync_tasks.get(zone)
+        if task is not None and not task.done():
+            self._dirty.add(zone)  # The running sync pushes again once it is done
+            return
+        self._sync_tasks[zone] = asyncio.create_task(self._sync(session, zone))
+
+    def resume_pending(self, session, zones):
+        """Push zones whose last local write never reached GitHub (before a restart, or after a sync gave up)."""
+        for zone in zones:
+            state = self.load(zone)
+            if state and not state["synced"]:
+                self.schedule_sync(session, zone)
+
+    async def _sync(self, session, zone: str):
+        while True:
+            self._dirty.discard(zone)
+            state = self.zones[zone]
+            delay = SYNC_BACKOFF
+            for attempt in range(1, SYNC_RETRIES + 1):
+                try:
+                    status, new_sha = await self.push(session, zone, state["tokens"], state["sha"])
+                    if status in (200, 201):
+                        state["sha"] = new_sha
+                        state["synced"] = zone not in self._dirty
+                        state["synced_at"] = datetime.now(timezone.utc).isoformat()
+                        self._save(zone)
+                        break
+                    if status in (409, 422):
+                        # Our SHA is stale: someone else committed the file
+                        state["sha"] = await self.fetch_sha(session, zone)
+                        self._save(zone)
+                except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                    status = f"error: {e}"  # Network or disk failure: counts as a failed attempt
+                logger.warning("Token sync failed", extra={"zone": zone, "status": status, "attempt": attempt})
+                await asyncio.sleep(delay)
+                delay *= 2
+            else:
+                logger.error("⚠️ Giving up syncing tokens until the next write", extra={"zone": zone})
+                return False
+            if zone not in self._dirty:
+                return True
+
+    def _save(self, zone: str):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(zone)
+        temp_file = path + ".tmp"
+        with open(temp_file, 'w', encoding="utf-8") as f:
+            json.dump(self.zones[zone], f, indent=2)
+        os.replace(temp_file, path)
@@ -0,0 +1,47 @@
+# web_server.py
+import logging
+import os
+from aiohttp import web
+
+import metrics
+import health
+
+logger = logging.getLogger(__name__)
+
+PORT = int(os.environ.get("PORT", 10000))
+
+
+def create_app(bot) -> web.Application:
+    """HTTP surface of the bot, served on the bot's own event loop."""
+
+    async def home(request):
+        return web.Response(text=f"Bot {bot.user} is active")
+
+    async def metrics_endpoint(request):
+        return web.Response(text=metrics.render(), content_type="text/plain", charset="utf-8",
+                            headers={"X-Prometheus-Format": "0.0.4"})
+
+    async def healthz(request):
+        alive, report = health.liveness(bot)
+        return web.json_response(report, status=200 if alive else 503)
+
+    async def readyz(request):
+        ready, report = health.readiness(bot)
+        return web.json_response(report, status=200 if ready else 503)
+
+    app = web.Application()
+    app.router.add_get("/", home)
+    app.router.add_get("/metrics", metrics_endpoint)
+    app.router.add_get("/healthz", healthz)
+    app.router.add_get("/readyz", readyz)
+    return app
+
+
+async def start(bot, port: int = PORT) -> web.AppRunner:
+    """Start the HTTP server. Call runner.cleanup() to stop it."""
+    runner = web.AppRunner(create_app(bot))
+    await runner.setup()
+    site = web.TCPSite(runner, host="0.0.0.0", port=port)
+    await site.start()
+    logger.info("✅ HTTP server listening on port %d", port)
+    return runner
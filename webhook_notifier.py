@@ -0,0 +1,102 @@
+# webhook_notifier.py
+import asyncio
+import logging
+import aiohttp
+from http_client import get_session
+from logs import sampled
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+NOTIFY_QUEUE_SIZE = 200     # Messages kept in memory before new ones are dropped
+BATCH_DELAY = 2             # Seconds to wait for more messages before posting
+MAX_CONTENT_LENGTH = 2000   # Discord message content limit
+
+
+class WebhookNotifier:
+    """
+    Queues notifications and posts them to a Discord webhook from a background task.
+    Several messages are coalesced into one post, and the webhook rate-limit headers are honoured.
+    When the queue is full, new messages are dropped and summarized in the next post.
+    """
+
+    def __init__(self, url: str | None):
+        self.url = url
+        self.queue = asyncio.Queue(maxsize=NOTIFY_QUEUE_SIZE)
+        self.dropped = 0
+        self._worker = None
+
+    def notify(self, message: str):
+        """Queue a message without blocking. Safe to call from any coroutine."""
+        if not self.url:
+            logger.debug("Webhook not configured, notification skipped", extra=sampled(0.1))
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self, timeout: float = 5):
+        """Try to flush pending messages, then stop the sender."""
+        if self._worker is None:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("%d notifications not sent on shutdown", self.queue.qsize())
+        self._worker.cancel()
+        self._worker = None
+
+    def _next_batch(self, first: str) -> tuple[str, int]:
+        """Coalesce queued messages into one post. Returns (content, number of messages taken)."""
+        lines = []
+        if self.dropped:
+            lines.append(f"⚠️ {self.dropped} notifications dropped (queue full).")
+            self.dropped = 0
+        lines.append(first)
+        taken = 1
+        length = sum(len(line) + 1 for line in lines)
+        while not self.queue.empty():
+            message = self.queue._queue[0]  # Peek so oversized messages stay for the next batch
+            if length + len(message) + 1 > MAX_CONTENT_LENGTH:
+                break
+            lines.append(self.queue.get_nowait())
+            length += len(message) + 1
+            taken += 1
+        return "\n".join(lines)[:MAX_CONTENT_LENGTH], taken
+
+    async def _post(self, content: str):
+        """Post one message, waiting out rate limits. Gives up on other errors."""
+        while True:
+            try:
+                async with get_session().post(self.url, json={"content": content}, timeout=aiohttp.ClientTimeout(total=5)) as r:
+                    if r.status == 429:
+                        retry_after = float(r.headers.get("Retry-After", 1))
+                        try:
+                            retry_after = float((await r.json()).get("retry_after", retry_after))
+                        except Exception:
+                            pass
+                        await asyncio.sleep(retry_after)
+                        continue
+                    if r.headers.get("X-RateLimit-Remaining") == "0":
+                        await asyncio.sleep(float(r.headers.get("X-RateLimit-Reset-After", 1)))
+                    return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Webhook post failed: %s", e)
+                return
+
+    async def _run(self):
+        while True:
+            first = await self.queue.get()
+            await asyncio.sleep(BATCH_DELAY)
+            content, taken = self._next_batch(first)
+            try:
+                await self._post(content)
+            finally:
+                for _ in range(taken):
+                    self.queue.task_done()